@@ -0,0 +1,57 @@
+"""Times loading API responses with marshmallow's Schema.load against the compiled ApiSchema.deserialize
+
+Run from the repository root with PYTHONPATH=.
+"""
+import time
+import uuid
+
+from bot.api.SkinsApi.SkinsApi import SkinsApi
+from bot.api.StreetRunnerApi.Leaderboard import LeaderboardKda, LeaderboardKills, LeaderboardTime
+from bot.api.StreetRunnerApi.Player import PlayerStatsArena, PlayerStatsTime
+
+REPEAT = 7
+ROWS = 1000
+
+
+def leaderboard(value):
+    return [{'uuid': str(uuid.UUID(int=i)), 'value': value(i)} for i in range(ROWS)]
+
+
+SAMPLES = (
+    ('LeaderboardKills', LeaderboardKills(), leaderboard(lambda i: i * 3)),
+    ('LeaderboardKda', LeaderboardKda(), leaderboard(lambda i: i / 7)),
+    ('LeaderboardTime', LeaderboardTime(), leaderboard(lambda i: i * 60.5)),
+    ('PlayerStatsArena', PlayerStatsArena(), {'infamy': 120, 'kills': 40, 'assists': 12, 'deaths': 9}),
+    ('PlayerStatsTime', PlayerStatsTime(), {'value': 36000}),
+    ('SkinsApi', SkinsApi(), {'id': uuid.UUID(int=1).hex, 'name': 'Player',
+                              'properties': [{'name': 'textures', 'value': 'e30=' * 100}]}),
+)
+
+
+def best_of(function, number: int) -> float:
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+
+    return best / number * 1e6
+
+
+def main():
+    print(f'{"schema":<20}{"load us":>12}{"compiled us":>14}{"speedup":>10}')
+
+    for name, schema, data in SAMPLES:
+        if schema.deserialize(data) != schema.load(data):
+            raise AssertionError(f'{name} loads differently')
+
+        number = 10 if schema.many else 2000
+        load = best_of(lambda: schema.load(data), number)
+        compiled = best_of(lambda: schema.deserialize(data), number)
+
+        print(f'{name:<20}{load:>12.1f}{compiled:>14.1f}{load / compiled:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Reports the size and decode time of a realistic set of api: cache entries in each Redis format
+
+text is the format used before cache codecs, the response JSON as it was received. The codecs store the fetch time
+along with the response, and are shown as stored, compressed past CACHE_CODEC_COMPRESS_MIN_BYTES, and uncompressed.
+
+Run from the repository root with PYTHONPATH=.
+"""
+import base64
+import json
+import random
+import time
+import timeit
+import uuid
+
+import store.CacheCodec
+from store.CacheCodec import CacheCodec
+
+REPEAT = 5
+PLAYERS = 500
+LEADERBOARD_ROWS = 1000
+
+
+def player_uuid(i: int) -> str:
+    return str(uuid.UUID(int=i * 7919))
+
+
+def key_set() -> list:
+    """The responses of the api: keys for the leaderboards and PLAYERS players"""
+    rng = random.Random(0)
+    responses = []
+
+    for value in (lambda: rng.randrange(10 ** 6), lambda: rng.random() * 10, lambda: rng.random() * 10 ** 7,
+                  lambda: rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')):
+        for _ in range(3):
+            responses.append([{'uuid': player_uuid(i), 'value': value()} for i in range(LEADERBOARD_ROWS)])
+
+    for i in range(PLAYERS):
+        name = f'Player{i}'
+        texture = base64.b64encode(json.dumps({
+            'timestamp': 1600000000000 + i,
+            'profileId': uuid.UUID(player_uuid(i)).hex,
+            'profileName': name,
+            'textures': {'SKIN': {'url': f'http://textures.minecraft.net/texture/{rng.getrandbits(256):064x}'}},
+        }).encode()).decode()
+
+        responses.extend([
+            {'name': name, 'uuid': player_uuid(i), 'discord': rng.getrandbits(60)},
+            {'value': rng.randrange(8)},
+            {'rank': rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 'blocks': rng.randrange(10 ** 7)},
+            {'infamy': rng.randrange(5000), 'kills': rng.randrange(10 ** 4), 'assists': rng.randrange(10 ** 4),
+             'deaths': rng.randrange(10 ** 4)},
+            {'value': rng.randrange(10 ** 7)},
+            {'value': rng.randrange(10 ** 6)},
+            [{'type': 'TITLE', 'name': 'Champion'}, {'type': 'PET', 'name': 'Cat'}],
+            {'money': rng.random() * 10 ** 7, 'tokens': rng.randrange(10 ** 5)},
+            {'id': uuid.UUID(player_uuid(i)).hex, 'name': name,
+             'properties': [{'name': 'textures', 'value': texture}]},
+        ])
+
+    return responses
+
+
+def text_encode(value) -> bytes:
+    return json.dumps(value).encode()
+
+
+def text_decode(data: bytes):
+    return json.loads(data)
+
+
+def best_of(function) -> float:
+    # timeit turns the garbage collector off while timing, which the decoded key set would otherwise trigger
+    return min(timeit.repeat(function, number=1, repeat=REPEAT)) * 1000
+
+
+def main():
+    responses = key_set()
+    entries = [[time.time(), response] for response in responses]
+    codec = CacheCodec()
+    compress_min_bytes = store.CacheCodec.CACHE_CODEC_COMPRESS_MIN_BYTES
+
+    formats = [('text', text_encode, text_decode, responses)]
+    for name in ('json', 'msgpack'):
+        formats.append((name, lambda value, name=name: codec.encode(value, name), codec.decode, entries))
+        formats.append((f'{name} uncompressed', lambda value, name=name: codec.encode(value, name), codec.decode,
+                        entries))
+
+    print(f'{len(responses)} keys')
+    print(f'{"format":<24}{"bytes":>12}{"vs text":>10}{"decode ms":>12}{"vs text":>10}')
+
+    baseline = None
+    for name, encode, decode, values in formats:
+        store.CacheCodec.CACHE_CODEC_COMPRESS_MIN_BYTES = float('inf') if 'uncompressed' in name else compress_min_bytes
+        encoded = [encode(value) for value in values]
+
+        if [decode(data) for data in encoded] != values:
+            raise AssertionError(f'{name} does not decode to what was encoded')
+
+        size = sum(len(data) for data in encoded)
+        decode_ms = best_of(lambda: [decode(data) for data in encoded])
+        baseline = baseline or (size, decode_ms)
+
+        print(f'{name:<24}{size:>12}{size / baseline[0]:>9.2f}x{decode_ms:>12.1f}{decode_ms / baseline[1]:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Compares the NumPy GIF encoder against the per pixel TransparentAnimatedGifConverter
+
+Run from the repository root with PYTHONPATH=.
+"""
+import functools
+import time
+from io import BytesIO
+
+from benchmarks.samples import animations
+from helpers import gif, pil_transparent_gifs
+
+REPEAT = 3
+
+ENCODERS = {
+    'old': pil_transparent_gifs.save_transparent_gif,
+    'full': functools.partial(gif.save_transparent_gif, delta=False),
+    'delta': gif.save_transparent_gif,
+}
+
+
+def measure(save, images) -> (float, int):
+    best = float('inf')
+    for _ in range(REPEAT):
+        fp = BytesIO()
+        start = time.perf_counter()
+        save(images, 1, fp, format='GIF', loop=0)
+        best = min(best, time.perf_counter() - start)
+
+    return best, fp.tell()
+
+
+def main():
+    print(f'{"animation":<28}{"frames":>7}' + ''.join(f'{name + " ms":>10}{name + " KB":>10}' for name in ENCODERS))
+
+    totals = {name: [0.0, 0] for name in ENCODERS}
+    for name, render in animations().items():
+        images = list(render.images)
+        row = f'{name:<28}{len(images):>7}'
+        for encoder, save in ENCODERS.items():
+            elapsed, size = measure(save, images)
+            totals[encoder][0] += elapsed
+            totals[encoder][1] += size
+            row += f'{elapsed * 1000:>10.1f}{size / 1024:>10.1f}'
+
+        print(row)
+
+    print(f'{"total":<35}' + ''.join(f'{elapsed * 1000:>10.1f}{size / 1024:>10.1f}'
+                                     for elapsed, size in totals.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import random
+from io import BytesIO
+from typing import Dict, List
+
+from PIL import Image
+
+from bot.card.DiscordAvatar import DiscordAvatar
+from bot.card.PlayerModel import PlayerModel
+from bot.card.Render import Render
+from bot.card.Ribbon import Ribbon
+from bot.card.Skin import Skin
+from bot.card.SpriteCache import Sprite
+from bot.card.StatsCard import STATS_CARD_BACKGROUND, StatsCard
+from bot.card.XPCard import XPCard
+from bot.card.XPLevelUp import XPLevelUp
+from bot.cosmetics.titles import known_titles
+from bot.player.stats import PlayerStatsType
+
+
+def skin(seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    image = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+    for x in range(0, 64, 4):
+        for y in range(0, 64, 4):
+            image.paste((rng.randrange(256), rng.randrange(256), rng.randrange(256), 255), (x, y, x + 4, y + 4))
+
+    fp = BytesIO()
+    image.save(fp, 'PNG')
+    return fp.getvalue()
+
+
+def avatar(seed: int = 0, frames: int = 8) -> bytes:
+    rng = random.Random(seed)
+    images = []
+    for i in range(frames):
+        image = Image.new('RGB', (128, 128), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        image.paste((rng.randrange(256), rng.randrange(256), rng.randrange(256)), (8 * i, 8 * i, 64 + 8 * i, 64 + 8 * i))
+        images.append(image)
+
+    fp = BytesIO()
+    images[0].save(fp, 'GIF', save_all=True, append_images=images[1:], duration=60, loop=0)
+    return fp.getvalue()
+
+
+def animations() -> Dict[str, Render]:
+    """Real card animations drawn from synthetic inputs, the way the bot sends them"""
+    renders = {
+        'xp_levelup': XPLevelUp.draw('Player', '0001', 4, 5, DiscordAvatar('sample', avatar(), True)),
+        'xp_card': XPCard.draw('Player', '0001', 1234, DiscordAvatar('sample', avatar(), True)),
+    }
+
+    for title in known_titles.values():
+        ribbon = getattr(title, 'ribbon', Ribbon).draw(title)
+        if ribbon.animated:
+            renders[f'ribbon_{title.id.lower()}'] = ribbon
+            renders[f'stats_card_{title.id.lower()}'] = StatsCard.draw(
+                'Player', [('RANK', 'Z'), ('BLOCKS', '12.3K')],
+                {'sprite': Sprite.from_image(PlayerModel.draw_sprite(Skin('sample', 'sample', skin(), False), 6).image)},
+                title, STATS_CARD_BACKGROUND[PlayerStatsType.Prison])
+
+    return renders
+
+
+def frames(render: Render) -> List[Image.Image]:
+    return list(render.images)
@@ -0,0 +1,53 @@
+"""Times drawing and encoding a level-up animation, against its budget of XP_LEVELUP_BUDGET_MS
+
+The frames column encodes the finished frames with save_transparent_gif, the layers column writes the
+palette indices the animation was assembled from.
+
+Run from the repository root with PYTHONPATH=.
+"""
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from benchmarks.samples import avatar
+from bot.card.DiscordAvatar import DiscordAvatar
+from bot.card.XPLevelUp import XPLevelUp
+from helpers.gif import save_indexed_gif, save_transparent_gif
+
+REPEAT = 7
+XP_LEVELUP_BUDGET_MS = 50
+
+
+def static_avatar() -> bytes:
+    fp = BytesIO()
+    Image.open(BytesIO(avatar())).convert('RGB').save(fp, 'PNG')
+    return fp.getvalue()
+
+
+def best_of(function) -> float:
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def main():
+    print(f'{"avatar":<12}{"draw ms":>10}{"frames ms":>12}{"layers ms":>12}{"total ms":>12}{"budget ms":>12}')
+
+    for name, avatar_data, animated in (('animated', avatar(), True), ('static', static_avatar(), False)):
+        discord_avatar = DiscordAvatar(name, avatar_data, animated)
+        render = XPLevelUp.draw('Player', '0001', 4, 5, discord_avatar)
+
+        draw = best_of(lambda: XPLevelUp.draw('Player', '0001', 4, 5, discord_avatar))
+        frames = best_of(lambda: save_transparent_gif(list(render.frames), 1, BytesIO(), format='GIF'))
+        layers = best_of(lambda: save_indexed_gif(*render.quantized, 1, BytesIO(), format='GIF'))
+
+        print(f'{name:<12}{draw:>10.1f}{frames:>12.1f}{layers:>12.1f}{draw + layers:>12.1f}{XP_LEVELUP_BUDGET_MS:>12}')
+
+
+if __name__ == '__main__':
+    main()
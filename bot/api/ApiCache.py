@@ -0,0 +1,154 @@
+import asyncio
+import collections
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import cachetools
+import sentry_sdk
+
+from helpers.utilities import SingletonBase
+from store.CacheCodec import CacheCodec, UnknownFormat
+from store.RedisClient import RedisClient
+
+API_CACHE_LOCAL_SIZE = int(os.environ.get('API_CACHE_LOCAL_SIZE', 4096))
+
+
+class ApiCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.redis_hits = 0
+        self.stale = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh_errors = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.redis_hits + self.stale + self.misses
+
+        return {
+            'hits': self.hits,
+            'redis_hits': self.redis_hits,
+            'stale': self.stale,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'refresh_errors': self.refresh_errors,
+            'hit_ratio': (lookups - self.misses) / lookups if lookups else 0.0,
+        }
+
+
+class ApiCache(SingletonBase):
+    """Two tier cache of API responses
+
+    Deserialized data is kept in a process local LRU in front of the raw responses in Redis. Each schema
+    declares how long its data stays fresh (__cache_ttl__) and for how much longer a stale copy may still be
+    served while it is refreshed in the background (__cache_stale__). Concurrent misses for the same
+    resource share a single request.
+    """
+
+    def __init__(self):
+        self._local = cachetools.LRUCache(API_CACHE_LOCAL_SIZE)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = collections.defaultdict(ApiCacheStats)
+
+    async def get(self, schema) -> Any:
+        if (url := schema.url()) is None:
+            return schema.deserialize(await schema.api_get())
+
+        key = schema.cache_key_for_url(url)
+        local_key = (schema.__class__.__name__, key)
+        stats = self._stats[schema.__class__.__name__]
+
+        if entry := self._local.get(local_key):
+            data, fetched = entry
+            if self._fresh(schema, fetched):
+                stats.hits += 1
+                return data
+
+            if self._usable(schema, fetched):
+                stats.stale += 1
+                self._revalidate(schema, key, local_key)
+                return data
+
+        if cached := await self._get_redis(key):
+            fetched, result = cached
+            if self._usable(schema, fetched):
+                data = schema.deserialize(result)
+                self._local[local_key] = data, fetched
+
+                if self._fresh(schema, fetched):
+                    stats.redis_hits += 1
+                else:
+                    stats.stale += 1
+                    self._revalidate(schema, key, local_key)
+
+                return data
+
+        stats.misses += 1
+        return await self._single_flight(local_key, lambda: self._refresh(schema, key, local_key))
+
+    def invalidate(self, schema):
+        if (url := schema.url()) is not None:
+            self._local.pop((schema.__class__.__name__, schema.cache_key_for_url(url)), None)
+
+    @staticmethod
+    def _fresh(schema, fetched: float) -> bool:
+        return time.time() - fetched < schema.__cache_ttl__
+
+    @staticmethod
+    def _usable(schema, fetched: float) -> bool:
+        return time.time() - fetched < schema.__cache_ttl__ + schema.__cache_stale__
+
+    @staticmethod
+    async def _get_redis(key: str) -> Optional[Tuple[float, Any]]:
+        if not (cached := await RedisClient().conn.get(f'api:{key}')):
+            return None
+
+        try:
+            fetched, result = CacheCodec().decode(cached)
+        except UnknownFormat:
+            # responses cached before codecs are fetched again
+            return None
+
+        return fetched, result
+
+    async def _refresh(self, schema, key: str, local_key: Tuple[str, str]) -> Any:
+        result = await schema.api_get()
+        fetched = time.time()
+
+        await RedisClient().conn.set(f'api:{key}', CacheCodec().encode([fetched, result]),
+                                     ex=schema.__cache_ttl__ + schema.__cache_stale__)
+
+        data = schema.deserialize(result)
+        self._local[local_key] = data, fetched
+        return data
+
+    async def _single_flight(self, key: Tuple[str, str], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if future := self._inflight.get(key):
+            self._stats[key[0]].coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self._inflight[key] = asyncio.ensure_future(fetch())
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def _revalidate(self, schema, key: str, local_key: Tuple[str, str]):
+        if local_key in self._inflight:
+            return
+
+        async def revalidate():
+            try:
+                await self._single_flight(local_key, lambda: self._refresh(schema, key, local_key))
+            except Exception as e:
+                self._stats[local_key[0]].refresh_errors += 1
+                sentry_sdk.capture_exception(e)
+
+        asyncio.ensure_future(revalidate())
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'local_entries': len(self._local),
+            'inflight': len(self._inflight),
+            'endpoints': {name: stats.as_dict() for name, stats in sorted(self._stats.items())},
+        }
@@ -0,0 +1,247 @@
+import importlib
+import inspect
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from marshmallow import EXCLUDE, RAISE, class_registry, fields, missing
+
+
+class ApiRecord:
+    """Loaded API data, with a slot for each field of the schema it was loaded with
+
+    Fields are read as attributes, and for code written against dicts also by key. A field missing from the
+    response is missing from the record, the same as with a dict.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _schema: type = None
+
+    def _has(self, key) -> bool:
+        return (key in self._fields or key in getattr(self, '__dict__', ())) and hasattr(self, key)
+
+    def __getitem__(self, key):
+        if self._has(key):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if self._has(key) else default
+
+    def __contains__(self, key) -> bool:
+        return self._has(key)
+
+    def keys(self):
+        return [key for key in (*self._fields, *getattr(self, '__dict__', ())) if hasattr(self, key)]
+
+    def values(self):
+        return [getattr(self, key) for key in self.keys()]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ApiRecord, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({dict(self.items())!r})'
+
+    def __reduce__(self):
+        return _unpickle_record, (self._schema.__module__, self._schema.__qualname__, dict(self.items()))
+
+
+def _unpickle_record(module: str, qualname: str, values: dict) -> ApiRecord:
+    schema = importlib.import_module(module)
+    for name in qualname.split('.'):
+        schema = getattr(schema, name)
+
+    record = object.__new__(compiled(schema).record)
+    for key, value in values.items():
+        setattr(record, key, value)
+
+    return record
+
+
+class Fallback(Exception):
+    """Raised by a compiled loader for input it does not handle itself"""
+
+
+class CompiledLoader:
+    def __init__(self, record: type, load_one: Callable[[Any, Any], ApiRecord]):
+        self.record = record
+        self.load_one = load_one
+
+
+_FAST_TYPES = {
+    fields.String: 'str',
+    fields.Integer: 'int',
+}
+
+
+def _field_source(name: str, field: fields.Field, namespace: Dict[str, Any], target: str) -> Optional[str]:
+    """Source that deserializes data[name] into target, or None if the field cannot be compiled"""
+    if field.dump_only or field.data_key not in (None, name) or field.attribute not in (None, name):
+        return None
+
+    namespace[f'field_{name}'] = field
+    deserialize = f'field_{name}.deserialize(v, {name!r}, data)'
+
+    if field.required or field.load_default is not missing:
+        return (f"    v = field_{name}.deserialize(data.get({name!r}, missing), {name!r}, data)\n"
+                f"    if v is not missing:\n"
+                f"        {target.format(name=name)} = v\n")
+
+    if isinstance(field, fields.Nested):
+        nested = class_registry.get_class(field.nested) if isinstance(field.nested, str) else field.nested
+        if not isinstance(nested, type) or compiled(nested) is None or field.only or field.exclude:
+            return None
+
+        namespace[f'nested_{name}'] = nested()
+        namespace[f'load_{name}'] = compiled(nested).load_one
+        if field.many:
+            value = (f'[load_{name}(nested_{name}, item) for item in v] if v.__class__ is list '
+                     f'else raise_fallback()')
+        else:
+            value = f'load_{name}(nested_{name}, v)'
+
+        value = f'({value}) if v is not None else {deserialize}'
+    elif field.validators:
+        value = deserialize
+    elif type(field) in _FAST_TYPES:
+        value = f'v if v.__class__ is {_FAST_TYPES[type(field)]} else {deserialize}'
+    elif type(field) is fields.Float:
+        # nan and infinity are the only floats that differ from themselves once zeroed
+        value = f'v if v.__class__ is float and v - v == 0.0 else {deserialize}'
+    elif type(field) is fields.Function and _takes_one_argument(field.deserialize_func):
+        namespace[f'function_{name}'] = field.deserialize_func
+        value = f'function_{name}(v) if v is not None else {deserialize}'
+    else:
+        value = deserialize
+
+    return (f"    if {name!r} in data:\n"
+            f"        v = data[{name!r}]\n"
+            f"        {target.format(name=name)} = {value}\n")
+
+
+def _takes_one_argument(function: Optional[Callable]) -> bool:
+    try:
+        return function is not None and len(inspect.signature(function).parameters) == 1
+    except (TypeError, ValueError):
+        return False
+
+
+def _post_load_hooks(schema: type) -> Optional[List[str]]:
+    """The post_load hooks of schema besides make_data, or None if they are not all plain per-item hooks
+
+    Hooks are read from marshmallow's private Schema._hooks, which is only trusted in the layout of the pinned
+    marshmallow: a mapping of tags to (name, pass_many, options) tuples.
+    """
+    hooks = getattr(schema, '_hooks', None)
+    if not isinstance(hooks, Mapping) or not all(isinstance(tag, str) for tag in hooks):
+        return None
+
+    names = []
+    for hook in hooks.get('post_load', ()):
+        if not isinstance(hook, tuple) or len(hook) != 3 or not isinstance(hook[2], Mapping):
+            return None
+
+        name, many, options = hook
+        if many or options.get('pass_original'):
+            return None
+        if name != 'make_data':
+            names.append(name)
+
+    return names
+
+
+def compile_schema(schema: type) -> Optional[CompiledLoader]:
+    """Generates a loader specialised to the fields of schema, or None if it has to be loaded by marshmallow"""
+    if schema.opts.unknown not in (RAISE, EXCLUDE):
+        return None
+
+    if (hooks := _post_load_hooks(schema)) is None:
+        return None
+
+    declared = schema._declared_fields
+
+    # results of other post_load hooks may add keys, which are kept in a __dict__ next to the slots
+    record = type(f'{schema.__name__}Record', (ApiRecord,), {
+        '__slots__': (*declared, *(('__dict__',) if hooks else ())),
+        '__module__': schema.__module__,
+        '_fields': tuple(declared),
+        '_schema': schema,
+    })
+
+    namespace = {
+        'Record': record,
+        'new': object.__new__,
+        'missing': missing,
+        'known': frozenset(declared),
+        'raise_fallback': _raise_fallback,
+    }
+
+    lines = ['def load_one(schema, data):\n',
+             '    if data.__class__ is not dict:\n',
+             '        raise_fallback()\n']
+    if schema.opts.unknown == RAISE:
+        lines.append('    if not data.keys() <= known:\n'
+                     '        raise_fallback()\n')
+
+    target = 'out[{name!r}]' if hooks else 'record.{name}'
+    lines.append('    out = {}\n' if hooks else '    record = new(Record)\n')
+
+    for name, field in declared.items():
+        if (source := _field_source(name, field, namespace, target)) is None:
+            return None
+        lines.append(source)
+
+    if hooks:
+        for hook in hooks:
+            lines.append(f'    out = schema.{hook}(out, many=False, partial=None)\n')
+        lines.append('    record = new(Record)\n'
+                     '    for key, value in out.items():\n'
+                     '        setattr(record, key, value)\n')
+
+    lines.append('    return record\n')
+
+    exec(compile(''.join(lines), f'<loader {schema.__module__}.{schema.__qualname__}>', 'exec'), namespace)
+    return CompiledLoader(record, namespace['load_one'])
+
+
+def _raise_fallback():
+    raise Fallback()
+
+
+def compiled(schema: type) -> Optional[CompiledLoader]:
+    if '_compiled_loader' not in schema.__dict__:
+        # set first, so that a schema nested in itself finds it while it is being compiled
+        schema._compiled_loader = None
+        schema._compiled_loader = compile_schema(schema)
+
+    return schema.__dict__['_compiled_loader']
+
+
+def load(schema, data) -> Any:
+    """Loads data with the compiled loader of the schema instance, in place of Schema.load"""
+    if (loader := compiled(type(schema))) is None or schema.only or schema.exclude or schema.partial:
+        return schema.load(data)
+
+    try:
+        if schema.many:
+            if data.__class__ is not list:
+                raise Fallback()
+            return [loader.load_one(schema, item) for item in data]
+
+        return loader.load_one(schema, data)
+    except Exception:
+        # marshmallow raises the ValidationError for anything the compiled loader could not take
+        return schema.load(data)
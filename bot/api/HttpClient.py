@@ -0,0 +1,93 @@
+import os
+import time
+
+import aiohttp
+
+from helpers.utilities import SingletonBase
+
+HTTP_LIMIT = int(os.environ.get('HTTP_LIMIT', 100))
+HTTP_LIMIT_PER_HOST = int(os.environ.get('HTTP_LIMIT_PER_HOST', 20))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get('HTTP_KEEPALIVE_TIMEOUT', 60))
+HTTP_DNS_CACHE_TTL = int(os.environ.get('HTTP_DNS_CACHE_TTL', 300))
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', 15))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+
+
+class HttpClientStats:
+    def __init__(self):
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        connections = self.connections_created + self.connections_reused
+        return self.connections_reused / connections if connections else 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_connection_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_connection_queued_end(session, ctx, params):
+            wait = time.perf_counter() - ctx.queued_at
+            self.queued += 1
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+
+class HttpClient(SingletonBase):
+    def __init__(self):
+        self._session = None
+        self._stats = HttpClientStats()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_LIMIT,
+                                               limit_per_host=HTTP_LIMIT_PER_HOST,
+                                               keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                                               ttl_dns_cache=HTTP_DNS_CACHE_TTL),
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                trace_configs=[self._stats.trace_config()],
+            )
+
+        return self._session
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'requests': self._stats.requests,
+            'connections_created': self._stats.connections_created,
+            'connections_reused': self._stats.connections_reused,
+            'reuse_ratio': self._stats.reuse_ratio,
+            'queued': self._stats.queued,
+            'queue_wait_avg': self._stats.queue_wait_total / self._stats.queued if self._stats.queued else 0.0,
+            'queue_wait_max': self._stats.queue_wait_max,
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+        self._session = None
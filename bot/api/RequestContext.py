@@ -0,0 +1,91 @@
+import asyncio
+import collections
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import sentry_sdk
+
+_current: contextvars.ContextVar[Optional['RequestContext']] = contextvars.ContextVar('request_context', default=None)
+
+
+class RequestContextStats:
+    def __init__(self):
+        self.invocations = 0
+        self.requests = 0
+        self.deduplicated = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'invocations': self.invocations,
+            'requests': self.requests,
+            'deduplicated': self.deduplicated,
+        }
+
+
+class RequestContext:
+    """API data fetched while handling one command, shared by everything the command does
+
+    While a context is entered, every ApiSchema.data lookup for the same schema, parameters and query awaits
+    the same future, so a resource is only fetched once per command however many objects ask for it.
+    """
+
+    _stats = collections.defaultdict(RequestContextStats)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.deduplicated = 0
+        self._futures: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._token = None
+
+    def __enter__(self) -> 'RequestContext':
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+
+        stats = self._stats[self.name]
+        stats.invocations += 1
+        stats.requests += self.requests
+        stats.deduplicated += self.deduplicated
+
+        sentry_sdk.add_breadcrumb(category='api.request', message=f'{self.name}: {self.requests} requests, '
+                                                                  f'{self.deduplicated} deduplicated')
+
+    @staticmethod
+    def key(schema) -> Optional[Tuple[str, str]]:
+        if (url := schema.url()) is None:
+            return None
+
+        return schema.__class__.__name__, schema.cache_key_for_url(url)
+
+    @classmethod
+    async def fetch(cls, schema, fetch: Callable[[Any], Awaitable[Any]]) -> Any:
+        """Fetches the data of schema, once per command if a context is active"""
+        if (context := _current.get()) is None or (key := cls.key(schema)) is None:
+            return await fetch(schema)
+
+        if future := context._futures.get(key):
+            context.deduplicated += 1
+            return await asyncio.shield(future)
+
+        context.requests += 1
+        future = context._futures[key] = asyncio.ensure_future(fetch(schema))
+
+        def forget_failed(done: asyncio.Future):
+            # a failed fetch is not remembered, so that it can be tried again
+            if (done.cancelled() or done.exception()) and context._futures.get(key) is done:
+                del context._futures[key]
+
+        future.add_done_callback(forget_failed)
+        return await asyncio.shield(future)
+
+    @classmethod
+    def invalidate(cls, schema):
+        if (context := _current.get()) is not None and (key := cls.key(schema)) is not None:
+            context._futures.pop(key, None)
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {name: stats.as_dict() for name, stats in sorted(cls._stats.items())}
@@ -5,6 +5,8 @@ from bot.api.api import ApiSchema
 
 class SkinsApi(ApiSchema):
     __endpoints__ = ['https://sessionserver.mojang.com/session/minecraft/profile/{uuid}/']
+    __cache_ttl__ = 600
+    __cache_stale__ = 3600
 
     class Meta:
         unknown = EXCLUDE
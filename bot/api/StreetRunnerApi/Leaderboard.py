@@ -7,6 +7,8 @@ from bot.api.StreetRunnerApi.StreetRunnerApi import StreetRunnerApi
 
 class Leaderboard(StreetRunnerApi):
     __endpoints__ = ['leaderboard/']
+    __cache_ttl__ = 60
+    __cache_stale__ = 600
 
 
 class LeaderboardData(Leaderboard):
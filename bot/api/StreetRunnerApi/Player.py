@@ -17,6 +17,9 @@ class Player(StreetRunnerApi):
 
 
 class PlayerInfo(Player):
+    __cache_ttl__ = 300
+    __cache_stale__ = 3600
+
     name = fields.String()
     uuid = fields.String()
     discord = fields.Integer(allow_none=True)
@@ -24,6 +27,8 @@ class PlayerInfo(Player):
 
 class PlayerPrivacy(Player):
     __endpoints__ = ['privacy/']
+    # never show stats a player has just hidden
+    __cache_stale__ = 0
 
     value = fields.Integer()
 
@@ -63,6 +68,7 @@ class PlayerXP(Player):
 
 class PlayerCosmetics(Player):
     __endpoints__ = ['cosmetics/']
+    __cache_ttl__ = 120
 
     def __init__(self, *args, **kwargs):
         kwargs.setdefault('many', True)
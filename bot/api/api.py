@@ -1,17 +1,41 @@
+import functools
 import hashlib
 import json
+import re
+import string
+import types
 import urllib
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
 
-import aiohttp
 import sentry_sdk
 from marshmallow import Schema, post_load
 from marshmallow.schema import SchemaMeta
 
+from bot.api import ApiLoader
+from bot.api.ApiCache import ApiCache
+from bot.api.HttpClient import HttpClient
+from bot.api.RequestContext import RequestContext
 from bot.exceptions import APIError
 from store.RedisClient import RedisClient
 
 
+class EndpointTemplate(NamedTuple):
+    """An endpoint with the names of the parameters it needs, so that it is only formatted once they are all given"""
+    template: str
+    params: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, template: str) -> 'EndpointTemplate':
+        return cls(template, frozenset(re.split(r'[.[]', field)[0]
+                                       for _, field, _, _ in string.Formatter().parse(template) if field is not None))
+
+    def format(self, params: Mapping[str, str]) -> Optional[str]:
+        return self.template.format(**params) if self.params <= params.keys() else None
+
+
 class ApiSchemaBase(SchemaMeta):
+    """Builds the endpoints of each schema, and the registry of the schemas chained under it, when it is created"""
+
     def __new__(cls, name, bases, attrs):
         paths = attrs.pop('__endpoints__', None)
         endpoints = []
@@ -24,8 +48,29 @@ class ApiSchemaBase(SchemaMeta):
         if not endpoints and paths:
             endpoints = paths
 
-        attrs['__endpoints__'] = endpoints
-        return super().__new__(cls, name, bases, attrs)
+        children = {}
+        attrs['__endpoints__'] = tuple(endpoints)
+        attrs['__templates__'] = tuple(EndpointTemplate.compile(endpoint) for endpoint in endpoints)
+        attrs['__children__'] = types.MappingProxyType(children)
+        attrs['_children'] = children
+        attrs['_endpoints_under'] = {}
+
+        schema = super().__new__(cls, name, bases, attrs)
+
+        for base in bases:
+            if isinstance(base, ApiSchemaBase):
+                base._children.setdefault(name, schema)
+                schema.endpoints_under(base.__endpoints__)
+
+        return schema
+
+    def endpoints_under(cls, prefixes: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[EndpointTemplate, ...]]:
+        """The endpoints of cls, and their templates, that extend one of prefixes"""
+        if (under := cls._endpoints_under.get(prefixes)) is None:
+            templates = tuple(template for template in cls.__templates__ if template.template.startswith(prefixes))
+            under = cls._endpoints_under[prefixes] = tuple(template.template for template in templates), templates
+
+        return under
 
 
 class ApiData(dict):
@@ -37,6 +82,10 @@ class ApiData(dict):
 
 
 class ApiSchema(Schema, metaclass=ApiSchemaBase):
+    # seconds data is served from cache, and how long after that a stale copy may be served while it is refreshed
+    __cache_ttl__ = 30
+    __cache_stale__ = 300
+
     def __init__(self, params=None, query=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -45,59 +94,43 @@ class ApiSchema(Schema, metaclass=ApiSchemaBase):
         self._data = None
 
     def __getattr__(self, attr):
-        for cls in self.__class__.__subclasses__():
-            if cls.__name__ == attr:
-                def subcls(params={}, *args, **kwargs):
-                    subinst = cls({**self._params, **params}, *args, **kwargs)
-                    subinst.__endpoints__ = [endpoint for endpoint in subinst.__endpoints__ if
-                                             any(endpoint.startswith(prefix) for prefix in self.__endpoints__)]
-                    return subinst
+        if (cls := type(self).__children__.get(attr)) is None:
+            raise AttributeError
+
+        def subcls(params={}, *args, **kwargs):
+            subinst = cls({**self._params, **params}, *args, **kwargs)
+            subinst.__endpoints__, subinst.__templates__ = cls.endpoints_under(self.__endpoints__)
+            return subinst
 
-                return subcls
+        return subcls
 
-        raise AttributeError
+    @functools.cached_property
+    def _url_params(self) -> Dict[str, str]:
+        return {k: urllib.parse.quote(str(v), safe='') for k, v in self._params.items() if v is not None}
 
     async def api_get(self, *args, **kwargs):
         with sentry_sdk.start_transaction(op='api.get', name=self.__class__.__name__):
-            conn = RedisClient().conn
-
-            for endpoint in self.__endpoints__:
-                try:
-                    url = endpoint.format(
-                        **{k: urllib.parse.quote(str(v), safe='') for k, v in self._params.items() if v is not None})
-                except KeyError:
-                    continue
+            if (url := self.url()) is None:
+                raise
 
-                cache_key = self.cache_key_for_url(url)
-                if cached := await conn.get(f'api:{cache_key}'):
-                    return json.loads(cached)
-
-                if query := urllib.parse.urlencode(self._query):
-                    url += '?' + query
+            if query := urllib.parse.urlencode(self._query):
+                url += '?' + query
 
-                with sentry_sdk.start_span(op='http', description=f'GET {url}') as span:
-                    try:
-                        async with aiohttp.ClientSession(raise_for_status=True) as s:
-                            async with s.get(url, *args, **kwargs) as r:
-                                result = await r.text()
-                                await conn.set(f'api:{cache_key}', result, ex=30)
-                                return json.loads(result)
-                    except APIError as e:
-                        if handler := getattr(self, f'api_get_{e.status}'):
-                            return handler()
-                        raise
-
-            raise
+            with sentry_sdk.start_span(op='http', description=f'GET {url}') as span:
+                try:
+                    async with HttpClient().session.get(url, *args, raise_for_status=True, **kwargs) as r:
+                        return json.loads(await r.text())
+                except APIError as e:
+                    if handler := getattr(self, f'api_get_{e.status}'):
+                        return handler()
+                    raise
 
     async def api_post(self, *args, **kwargs):
         with sentry_sdk.start_transaction(op='api.post', name=self.__class__.__name__):
             conn = RedisClient().conn
 
-            for endpoint in self.__endpoints__:
-                try:
-                    url = endpoint.format(
-                        **{k: urllib.parse.quote(str(v), safe='') for k, v in self._params.items() if v is not None})
-                except KeyError:
+            for template in self.__templates__:
+                if (url := template.format(self._url_params)) is None:
                     continue
 
                 cache_key = self.cache_key_for_url(url)
@@ -105,17 +138,25 @@ class ApiSchema(Schema, metaclass=ApiSchemaBase):
 
                 with sentry_sdk.start_span(op='http', description=f'POST {url}') as span:
                     try:
-                        async with aiohttp.ClientSession(raise_for_status=True) as s:
-                            async with s.post(url, *args, **kwargs) as r:
-                                return
+                        async with HttpClient().session.post(url, *args, raise_for_status=True, **kwargs):
+                            return
                     except APIError as e:
                         if handler := getattr(self, f'api_post_{e.status}'):
                             return handler()
                         raise
 
+    def url(self):
+        for template in self.__templates__:
+            if (url := template.format(self._url_params)) is not None:
+                return url
+
     def cache_key_for_url(self, url):
         return hashlib.md5((url + json.dumps(self._query, sort_keys=True)).encode()).hexdigest()
 
+    def deserialize(self, data):
+        """Loads data like Schema.load, into ApiRecords through the loader compiled for this schema"""
+        return ApiLoader.load(self, data)
+
     @post_load
     def make_data(self, data, **kwargs):
         return ApiData(data)
@@ -127,10 +168,12 @@ class ApiSchema(Schema, metaclass=ApiSchemaBase):
     @property
     async def data(self):
         if not self._data:
-            self._data = self.load(await self.api_get())
+            self._data = await RequestContext.fetch(self, ApiCache().get)
 
         return self._data
 
     async def update(self, data):
-        self._data = self.load(data)
+        self._data = self.deserialize(data)
+        ApiCache().invalidate(self)
+        RequestContext.invalidate(self)
         await self.api_post(json=data)
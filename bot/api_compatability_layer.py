@@ -2,59 +2,60 @@ import base64
 import datetime
 import json
 import os
-from io import BytesIO
 from typing import AsyncGenerator, List, Tuple
 
-import aiohttp
 import nextcord
-from asyncache import cached
-from cachetools import TTLCache
 
+from bot.api.HttpClient import HttpClient
 from bot.api.SkinsApi.SkinsApi import SkinsApi
 from bot.api.StreetRunnerApi.Player import Player
+from bot.card.Skin import Skin
 from bot.cosmetics import pets, titles
 from bot.cosmetics.cosmetics import Cosmetics, CosmeticsType
 from bot.exceptions import APIError
 from bot.player.privacy import Privacy
 from bot.player.stats import PlayerInfo
+from helpers.cache import single_flight_cached
 from store.RedisClient import RedisClient
 
+SKIN_FETCH_CACHE_MAX_BYTES = int(os.environ.get('SKIN_FETCH_CACHE_MAX_BYTES', 8 * 1024 * 1024))
 
-@cached(cache=TTLCache(maxsize=1024, ttl=86400))
-async def get_skin(uuid: str) -> dict:
+
+@single_flight_cached(maxsize=1024, ttl=86400, max_size=SKIN_FETCH_CACHE_MAX_BYTES,
+                      getsizeof=lambda skin: len(skin.data))
+async def get_skin(uuid: str) -> Skin:
     conn = RedisClient().conn
-    if cached := await conn.hgetall(f'skins:{uuid}'):
-        return {
-            'skin': BytesIO(base64.b64decode(cached[b'skin'])),
-            'slim': cached[b'slim'] == b'1',
-        }
+    if cached := await conn.hgetall(f'skin:{uuid}'):
+        return Skin(uuid, cached[b'texture'].decode(), cached[b'skin'], cached[b'slim'] == b'1')
 
     skin_data = await SkinsApi({'uuid': uuid}).data
 
     for prop in skin_data.properties:
         if prop['name'] == 'textures':
-            async with aiohttp.ClientSession() as s:
-                async with s.get(json.loads(base64.b64decode(prop['value']))['textures']['SKIN']['url']) as r:
-                    if r.status != 200:
-                        raise APIError(r)
-                    skin = await r.read()
-
-            await conn.hset(f'skins:{uuid}', mapping={
-                'skin': base64.b64encode(skin).decode(),
-                'slim': 1 if skin_data.get('metadata', {}).get('model', '') == 'slim' else 0,
+            url = json.loads(base64.b64decode(prop['value']))['textures']['SKIN']['url']
+            async with HttpClient().session.get(url) as r:
+                if r.status != 200:
+                    raise APIError(r)
+                data = await r.read()
+
+            # texture urls end in the hash of the texture, so a changed skin gets a new key
+            skin = Skin(uuid, url.rstrip('/').rsplit('/', 1)[-1], data,
+                        skin_data.get('metadata', {}).get('model', '') == 'slim')
+
+            await conn.hset(f'skin:{uuid}', mapping={
+                'skin': skin.data,
+                'texture': skin.texture,
+                'slim': int(skin.slim),
             })
 
-            await conn.expire(f'skins:{uuid}', datetime.timedelta(days=1))
+            await conn.expire(f'skin:{uuid}', datetime.timedelta(days=1))
 
-            return {
-                'skin': BytesIO(skin),
-                'slim': skin_data.get('metadata', {}).get('model', '') == 'slim',
-            }
+            return skin
 
     raise APIError()
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=86400))
+@single_flight_cached(maxsize=1024, ttl=86400)
 async def resolve_uuid(*, username: str = None, discord_id: int = None) -> str:
     conn = RedisClient().conn
     cache_key = f'uuid:username:{username}' if username else f'uuid:discord:{discord_id}'
@@ -123,14 +124,13 @@ async def get_chat_xp(discord_id: List[int], timerange: List[Tuple[datetime.date
 
         id_map[str(discord_id[i])] = i
 
-    async with aiohttp.ClientSession() as s:
-        async with s.post(
-                'https://streetrunner.gg/api/xp/', json=query, ssl=False,
-                headers={'Authorization': os.environ['API_KEY']}) as r:
-            if r.status != 200:
-                raise APIError(r)
+    async with HttpClient().session.post(
+            'https://streetrunner.gg/api/xp/', json=query, ssl=False,
+            headers={'Authorization': os.environ['API_KEY']}) as r:
+        if r.status != 200:
+            raise APIError(r)
 
-            result = await r.json()
+        result = await r.json()
 
     deltas = [0] * len(discord_id)
 
@@ -1,7 +1,7 @@
-from PIL import Image
-
 from bot.api_compatability_layer import get_skin
 from bot.card.Render import Render, Renderable
+from bot.card.Skin import Skin
+from bot.card.SpriteCache import Sprite, SpriteCache
 
 
 class Avatar(Renderable):
@@ -9,12 +9,15 @@ class Avatar(Renderable):
         self._uuid = uuid
         self._scale = scale
 
-    async def render(self) -> Render:
-        image_skin = Image.open((await get_skin(self._uuid))['skin'])
+    async def prepare(self) -> dict:
+        return {
+            'sprite': await SpriteCache().get('avatar', await get_skin(self._uuid), self._scale, self.draw_sprite),
+        }
 
-        head_front = image_skin.crop((8, 8, 16, 16)).resize((8 * self._scale, 8 * self._scale), Image.NEAREST)
-        if image_skin.crop((32, 0, 64, 32)).getextrema()[3][0] < 255:
-            head_front.alpha_composite(
-                image_skin.crop((40, 8, 48, 16)).resize((8 * self._scale, 8 * self._scale), Image.NEAREST))
+    @staticmethod
+    def draw(sprite: Sprite) -> Render:
+        return Render(sprite.image)
 
-        return Render(head_front)
+    @staticmethod
+    def draw_sprite(skin: Skin, scale: int) -> Render:
+        return Render(skin.parts.scaled('head_front', scale))
@@ -1,11 +1,14 @@
 import math
-from PIL import Image, ImageDraw, ImageFont
+from typing import List, Tuple
+
+from PIL import Image, ImageDraw
 
 from bot.api.StreetRunnerApi.Player import Player
 from bot.card.PlayerCard import PlayerCard
 from bot.card.PlayerModel import PlayerModel
 from bot.card.Render import Render
-from bot.card.card import FONT_MC_REGULAR, SPACING
+from bot.card.card import SPACING
+from bot.card.fonts import FONT_MC_REGULAR, get_font, text_bbox
 from bot.player.balance import BalanceType
 from bot.player.privacy import Privacy
 from helpers.utilities import get_number_representation
@@ -24,9 +27,7 @@ BALANCE_CARD_BACKGROUNDS = {
 
 
 class BalanceCard(PlayerCard):
-    async def render(self) -> Render:
-        self._font = ImageFont.truetype(FONT_MC_REGULAR, 18)
-
+    async def prepare(self) -> dict:
         player = Player({'mc_username': self._username, 'discord_id': self._discord_user.id})
         balances = []
 
@@ -41,6 +42,15 @@ class BalanceCard(PlayerCard):
 
             balances.append((balance_bg, balance.balance))
 
+        return {
+            'balances': balances,
+            'model': await PlayerModel((await player.PlayerInfo().data).uuid, 3).prepare(),
+        }
+
+    @staticmethod
+    def draw(balances: List[Tuple[str, int]], model: dict) -> Render:
+        font = get_font(FONT_MC_REGULAR, 18)
+
         image_base = Image.new('RGBA', (BALANCE_WIDTH, 2 * (BALANCE_RING_RADIUS + BALANCE_ICON_WIDTH + SPACING)),
                                color=(0, 0, 0, 0))
         draw_base = ImageDraw.Draw(image_base)
@@ -51,7 +61,7 @@ class BalanceCard(PlayerCard):
                            image_base.height // 2 + BALANCE_RING_RADIUS),
                           (0, 0, 0, 0), (127, 127, 127, 143), BALANCE_RING_WIDTH)
 
-        image_model = (await PlayerModel((await player.PlayerInfo().data).uuid, 3).render()).image
+        image_model = PlayerModel.draw(**model).image
         image_base.paste(image_model, ((image_base.width - image_model.width) // 2,
                                        (image_base.height - image_model.height) // 2),
                          mask=image_model)
@@ -66,10 +76,9 @@ class BalanceCard(PlayerCard):
             image_icon = Image.open(balance_bg).resize((BALANCE_ICON_WIDTH, BALANCE_ICON_WIDTH), Image.NEAREST)
             image_base.paste(image_icon, (x - BALANCE_ICON_WIDTH // 2, y - BALANCE_ICON_WIDTH // 2), mask=image_icon)
 
-            x0, y0, x1, y1 = draw_base.textbbox((x + direction[0] * BALANCE_ICON_WIDTH,
-                                                 y + direction[1] * BALANCE_ICON_WIDTH),
-                                                get_number_representation(value),
-                                                self._font, anchor='rm' if direction[0] < 0 else 'lm')
+            x0, y0, x1, y1 = text_bbox(FONT_MC_REGULAR, 18, get_number_representation(value),
+                                       (x + direction[0] * BALANCE_ICON_WIDTH, y + direction[1] * BALANCE_ICON_WIDTH),
+                                       anchor='rm' if direction[0] < 0 else 'lm')
             draw_base.rectangle((x0 - 6, y0 - 8, x1 + 6, y1 + 8), (27, 12, 27, 248), (0, 0, 0, 0), 0)
             draw_base.rectangle((x0 - 8, y0 - 6, x1 + 8, y1 + 6), (27, 12, 27, 248), (0, 0, 0, 0), 0)
             draw_base.rectangle((x0 - 6, y0 - 6, x1 + 6, y1 + 6), (27, 12, 27, 248), (42, 8, 92, 255), 2)
@@ -77,7 +86,7 @@ class BalanceCard(PlayerCard):
             draw_base.text((x + direction[0] * BALANCE_ICON_WIDTH,
                             y + direction[1] * BALANCE_ICON_WIDTH),
                            get_number_representation(value),
-                           (255, 255, 255), self._font, anchor='rm' if direction[0] < 0 else 'lm')
+                           (255, 255, 255), font, anchor='rm' if direction[0] < 0 else 'lm')
 
             angle += angle_sector
 
@@ -0,0 +1,113 @@
+import asyncio
+import os
+from io import BytesIO
+from typing import Iterable, List, NamedTuple, Tuple
+
+import nextcord
+from cachetools import LRUCache, cached
+from PIL import Image, ImageDraw, ImageSequence
+
+from helpers.utilities import SingletonBase
+from store.RedisClient import RedisClient
+
+DISCORD_AVATAR_CACHE_TTL = int(os.environ.get('DISCORD_AVATAR_CACHE_TTL', 86400))
+DISCORD_AVATAR_CACHE_MAX_BYTES = int(os.environ.get('DISCORD_AVATAR_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+AVATAR_FRAMES_CACHE_MAX_BYTES = int(os.environ.get('AVATAR_FRAMES_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+
+class DiscordAvatar(NamedTuple):
+    key: str
+    data: bytes
+    animated: bool
+
+    def frames(self, size: int) -> 'AvatarFrames':
+        return decode_avatar(self, size)
+
+
+class AvatarFrames:
+    """The frames of an avatar resized to size by size, with the circle they are pasted through"""
+
+    def __init__(self, image: Image.Image, size: int):
+        self.frames = [frame.resize((size, size)).convert('RGBA') for frame in ImageSequence.Iterator(image)]
+
+        self.mask = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        ImageDraw.Draw(self.mask).ellipse((0, 0, size, size), fill=(255, 255, 255, 255))
+
+    @property
+    def nbytes(self) -> int:
+        return 4 * self.mask.width * self.mask.height * (len(self.frames) + 1)
+
+
+# Decoded avatars are kept per process, like skins, so that each render worker only decodes one once per size
+@cached(cache=LRUCache(maxsize=AVATAR_FRAMES_CACHE_MAX_BYTES, getsizeof=lambda frames: frames.nbytes),
+        key=lambda avatar, size: (avatar.key, avatar.animated, size))
+def decode_avatar(avatar: DiscordAvatar, size: int) -> AvatarFrames:
+    return AvatarFrames(Image.open(BytesIO(avatar.data)), size)
+
+
+class DiscordAvatarCache(SingletonBase):
+    """Discord avatars as downloaded from the CDN, keyed by the avatar hash
+
+    A changed avatar gets a new hash, so entries never have to be revalidated against the CDN.
+    """
+
+    def __init__(self):
+        self._avatars = LRUCache(DISCORD_AVATAR_CACHE_MAX_BYTES, getsizeof=lambda avatar: len(avatar.data))
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    async def fetch(asset: nextcord.Asset, size: int, animated: bool) -> Tuple[bytes, bool]:
+        if animated:
+            try:
+                return await asset.with_size(size).with_format('gif').read(), True
+            except nextcord.InvalidArgument:
+                pass
+
+        return await asset.with_size(size).with_static_format('png').read(), False
+
+    async def get(self, user: nextcord.User, size: int, animated: bool = False) -> DiscordAvatar:
+        """The avatar of user at size, animated if asked for and the avatar has animation"""
+        asset = user.display_avatar
+
+        key = asset.key, size, animated
+        if avatar := self._avatars.get(key):
+            self._hits += 1
+            return avatar
+
+        conn = RedisClient().conn
+        redis_key = f'discord_avatar:{asset.key}:{size}:{"gif" if animated else "png"}'
+
+        if cached := await conn.hgetall(redis_key):
+            self._redis_hits += 1
+            avatar = DiscordAvatar(asset.key, cached[b'data'], cached[b'animated'] == b'1')
+        else:
+            self._misses += 1
+            avatar = DiscordAvatar(asset.key, *await self.fetch(asset, size, animated))
+
+            await conn.hset(redis_key, mapping={
+                'data': avatar.data,
+                'animated': int(avatar.animated),
+            })
+            await conn.expire(redis_key, DISCORD_AVATAR_CACHE_TTL)
+
+        self._avatars[key] = avatar
+        return avatar
+
+    async def get_many(self, users: Iterable[nextcord.User], size: int, animated: bool = False) -> List[DiscordAvatar]:
+        """The avatars of users, with the ones that are not cached yet fetched in parallel"""
+        return list(await asyncio.gather(*(self.get(user, size, animated) for user in users)))
+
+    @property
+    def stats(self) -> dict:
+        lookups = self._hits + self._redis_hits + self._misses
+
+        return {
+            'entries': len(self._avatars),
+            'bytes': self._avatars.currsize,
+            'hits': self._hits,
+            'redis_hits': self._redis_hits,
+            'misses': self._misses,
+            'hit_ratio': (self._hits + self._redis_hits) / lookups if lookups else 0.0,
+        }
@@ -1,10 +1,10 @@
-from typing import Iterable, Optional, TypeVar
+import asyncio
+from typing import Iterable, List, Optional, TypeVar
 
 from PIL import Image, ImageDraw
 
 from bot.card.card import SPACING
 from bot.card.Render import Render, Renderable
-from bot.player.stats import PlayerInfo
 
 T = TypeVar('T')
 LEADERBOARD_GENERIC_WIDTH = 580
@@ -27,10 +27,23 @@ class GenericLeaderboard(Renderable):
     async def fill_separator(self) -> bool:
         return False
 
-    async def render_row(self, ctx, player_info: PlayerInfo) -> Render:
+    async def layout(self) -> dict:
+        return {}
+
+    async def row_data(self, entry: T) -> dict:
+        raise NotImplementedError()
+
+    @staticmethod
+    def row_width(ctx, **row) -> float:
+        """Width a row needs to fit its contents, which may be more than ROW_WIDTH"""
+        return ctx['ROW_WIDTH']
+
+    @staticmethod
+    def draw_row(ctx, **row) -> Render:
         raise NotImplementedError()
 
-    async def render_separator(self, ctx) -> Render:
+    @staticmethod
+    def draw_separator(ctx) -> Render:
         image_dots = Image.new('RGBA', (ctx['ROW_WIDTH'], 30), color=(0, 0, 0, 0))
         radius = 10
 
@@ -51,52 +64,60 @@ class GenericLeaderboard(Renderable):
 
         return Render(image_dots)
 
-    async def render(self) -> Render:
-        async def get_rows():
-            rows = []
-            for i, entry in enumerate(self._data):
-                if self._target_position > 4 and i > 3 or i > 4:
-                    break
+    async def prepare(self) -> dict:
+        data = await self.data
+        target = await self.target
+        target_position = await self.target_position
 
-                rows.append(
-                    (await self.render_row({**ctx, 'POSITION': i + 1, 'ROW_HEIGHT': 75 + (2 if i else 4) * SPACING},
-                                           entry)).image)
+        shown = []
+        for i, entry in enumerate(data):
+            if target_position > 4 and i > 3 or i > 4:
+                break
 
-            if self._target_position > 4:
-                rows.append(
-                    (await self.render_row(
-                        {**ctx, 'POSITION': self._target_position + 1, 'ROW_HEIGHT': 75 + 4 * SPACING},
-                        self._target)).image)
+            shown.append(entry)
 
-            return rows
+        if target_position > 4:
+            shown.append(target)
 
-        self._data = await self.data
-        self._target = await self.target
-        self._target_position = await self.target_position
-        self._separator_filled = await self.fill_separator
+        rows = await asyncio.gather(*(self.row_data(entry) for entry in shown))
 
+        return {
+            'layout': await self.layout(),
+            'entries': rows[:-1] if target_position > 4 else rows,
+            'target_entry': rows[-1] if target_position > 4 else None,
+            'target_position': target_position,
+            'separator_filled': await self.fill_separator,
+        }
+
+    @classmethod
+    def draw(cls, layout: dict, entries: List[dict], target_entry: Optional[dict], target_position: int,
+             separator_filled: bool) -> Render:
         ctx = {
+            **layout,
             'ROW_WIDTH': LEADERBOARD_GENERIC_WIDTH,
             'ROW_HEIGHT': 75 + 2 * SPACING,
         }
 
-        rows = await get_rows()
+        rows = [({**ctx, 'POSITION': i + 1, 'ROW_HEIGHT': 75 + (2 if i else 4) * SPACING}, entry)
+                for i, entry in enumerate(entries)]
+        if target_entry:
+            rows.append(({**ctx, 'POSITION': target_position + 1, 'ROW_HEIGHT': 75 + 4 * SPACING}, target_entry))
 
-        rows_width = max(row.width for row in rows)
-        if rows_width > ctx['ROW_WIDTH']:
-            ctx['ROW_WIDTH'] = rows_width
-            rows = await get_rows()
+        # every row is measured first, so that all of them are drawn once at the width of the widest
+        ctx['ROW_WIDTH'] = max([ctx['ROW_WIDTH'], *(int(cls.row_width(row_ctx, **entry)) for row_ctx, entry in rows)])
+        rows = [cls.draw_row({**row_ctx, 'ROW_WIDTH': ctx['ROW_WIDTH']}, **entry).image for row_ctx, entry in rows]
 
+        rows_width = max(row.width for row in rows)
         rows_height = sum(row.height for row in rows)
 
-        if self._target_position < 5:
+        if target_position < 5:
             image_base = Image.new('RGBA', (rows_width, rows_height), color=(0, 0, 0, 0))
             draw_base = ImageDraw.Draw(image_base)
 
             draw_base.rounded_rectangle((0, 0, rows_width, rows_height),
                                         fill=(32, 34, 37, 255), radius=15)
         else:
-            render_separator = await self.render_separator({'ROW_WIDTH': rows_width})
+            render_separator = cls.draw_separator({**layout, 'ROW_WIDTH': rows_width})
             image_separator = render_separator.image
             image_separator_height = getattr(render_separator, 'preferred_height', image_separator.height)
 
@@ -104,7 +125,7 @@ class GenericLeaderboard(Renderable):
                                    color=(0, 0, 0, 0))
             draw_base = ImageDraw.Draw(image_base)
 
-            if self._separator_filled:
+            if separator_filled:
                 draw_base.rounded_rectangle(
                     (0, 0, rows_width, rows_height + image_separator_height),
                     fill=(32, 34, 37, 255), radius=15)
@@ -1,24 +1,47 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
 import asyncstdlib as a
 import nextcord
-from PIL import Image, ImageDraw, ImageFont
+import sentry_sdk
+from cachetools import LRUCache
+from PIL import Image, ImageDraw
 
 import bot.api.StreetRunnerApi.Leaderboard as Leaderboard
 from bot.api.StreetRunnerApi.Player import Player
 from bot.api_compatability_layer import get_leaderboard, get_player_info, get_position
 from bot.card.Avatar import Avatar
 from bot.card.Render import Render, Renderable
-from bot.card.card import FONT_BLACK, FONT_BOLD, SPACING
+from bot.card.card import SPACING
+from bot.card.fonts import FONT_BLACK, FONT_BOLD, get_font, text_bbox, text_length
 from bot.exceptions import DiscordNotLinkedError, NotEnoughDataError
 from bot.player.balance import BalanceType
+from bot.player.hydrate import hydrate
 from bot.player.privacy import Privacy
 from bot.player.stats import PlayerInfo
 from helpers.utilities import get_number_representation
 
 LEADERBOARD_PODIUM_WIDTH = 540
 LEADERBOARD_PODIUM_HEIGHT = 500
+LEADERBOARD_PODIUM_HIGHLIGHT_SCALES = (10, 7, 7)
+LEADERBOARD_PODIUM_ROW_SCALE = 6
+LEADERBOARD_SNAPSHOT_MAX_AGE = int(os.environ.get('LEADERBOARD_SNAPSHOT_MAX_AGE', 180))
+LEADERBOARD_SNAPSHOT_LAYOUTS = int(os.environ.get('LEADERBOARD_SNAPSHOT_LAYOUTS', 8))
+
+
+class PodiumSnapshot(NamedTuple):
+    taken: float
+    data: dict
 
 
 class Podium(Renderable):
+    hydrate_schemas = []
+    _snapshots = {}
+    # parts of the latest snapshot of each podium, drawn once by the process rendering on top of it
+    _prerendered = {}
+
     def __init__(self, username: str, discord_user: nextcord.User, leaderboard_type, display_name='',
                  privacy: Privacy = 0):
         self._username = username
@@ -31,16 +54,31 @@ class Podium(Renderable):
     async def get_stats(self, player_info: PlayerInfo) -> str:
         raise NotImplementedError()
 
-    async def render_row(self, ctx, player_info: PlayerInfo) -> Render:
+    async def row_data(self, player_info: PlayerInfo, scale: int) -> dict:
+        return {
+            'avatar': await Avatar(await player_info.uuid, scale).prepare(),
+            'username': await player_info.username,
+            'stats': await self.get_stats(player_info),
+            'highlighted': self._target_position != -1 and (await player_info.username) == (
+                await self._target_player_info.username),
+        }
+
+    @staticmethod
+    def row_width(ctx, avatar: dict, username: str, stats: str, **row) -> float:
+        return (12 * SPACING + ctx['POSITION_LENGTH'] + avatar['sprite'].size[0] + text_length(FONT_BOLD, 18, username)
+                + text_length(FONT_BOLD, 18, stats))
+
+    @staticmethod
+    def draw_row(ctx, avatar: dict, username: str, stats: str, highlighted: bool) -> Render:
         image_row = Image.new('RGBA', (ctx['ROW_WIDTH'], 100), color=(0, 0, 0, 0))
         draw_row = ImageDraw.Draw(image_row)
 
-        image_avatar = (await Avatar(await player_info.uuid, 6).render()).image
+        font_position = get_font(FONT_BLACK, 24)
+        font_stats = get_font(FONT_BOLD, 18)
 
-        length_name = draw_row.textlength(await player_info.username, self._font_stats)
-        length_stats = draw_row.textlength(await self.get_stats(player_info), self._font_stats)
+        image_avatar = Avatar.draw(**avatar).image
 
-        width_required = 12 * SPACING + self._position_length + image_avatar.width + length_name + length_stats
+        width_required = Podium.row_width(ctx, avatar, username, stats)
         if width_required > image_row.width:
             image_row = Image.new('RGBA', (int(width_required), 100), color=(0, 0, 0, 0))
             draw_row = ImageDraw.Draw(image_row)
@@ -48,54 +86,62 @@ class Podium(Renderable):
         draw_row.rounded_rectangle((0, 0, image_row.width, image_row.height), fill=(32, 34, 37, 255), radius=15)
 
         draw_row.text(
-            (2 * SPACING + self._position_length // 2, image_row.height // 2),
-            f'#{ctx["POSITION"]}', (214, 214, 214, 255), self._font_position, anchor='mm')
+            (2 * SPACING + ctx['POSITION_LENGTH'] // 2, image_row.height // 2),
+            f'#{ctx["POSITION"]}', (214, 214, 214, 255), font_position, anchor='mm')
 
         image_row.paste(image_avatar,
-                        (4 * SPACING + self._position_length, (image_row.height - image_avatar.height) // 2))
+                        (4 * SPACING + ctx['POSITION_LENGTH'], (image_row.height - image_avatar.height) // 2))
 
-        draw_row.text((6 * SPACING + self._position_length + image_avatar.width, image_row.height // 2),
-                      await player_info.username,
-                      (212, 175, 55, 255) if self._target_position != -1 and (await player_info.username) == (
-                          await self._target_player_info.username) else (255, 255, 255, 255), self._font_stats,
+        draw_row.text((6 * SPACING + ctx['POSITION_LENGTH'] + image_avatar.width, image_row.height // 2),
+                      username, (212, 175, 55, 255) if highlighted else (255, 255, 255, 255), font_stats,
                       anchor='lm')
 
         draw_row.text((image_row.width - 2 * SPACING, image_row.height // 2),
-                      await self.get_stats(player_info), (255, 255, 255, 255), self._font_stats, anchor='rm')
+                      stats, (255, 255, 255, 255), font_stats, anchor='rm')
 
         return Render(image_row)
 
-    async def render(self) -> Render:
-        async def get_rows():
-            rows = []
+    async def prepare(self) -> dict:
+        await self.prepare_target()
 
-            async for i, player_info in a.enumerate(rows_data):
-                rows.append((await self.render_row({**ctx, 'POSITION': i + 4}, player_info)).image)
+        # callers shown on the podium are highlighted in it, everyone else sees the shared snapshot
+        if (snapshot := self.snapshot) and not 0 <= self._target_position < 8:
+            return await self.prepare_from_snapshot(snapshot)
 
-            if self._target_position >= 8:
-                row_height = 30
-                radius = 10
+        return await self.prepare_leaderboard()
 
-                image_row = Image.new('RGBA', (ctx['ROW_WIDTH'], row_height), color=(0, 0, 0, 0))
-                draw_row = ImageDraw.Draw(image_row)
-                draw_row.ellipse(
-                    ((ctx['ROW_WIDTH'] - radius) // 2, (row_height - radius) // 2,
-                     (ctx['ROW_WIDTH'] + radius) // 2, (row_height + radius) // 2), fill=(209, 222, 241, 255))
-                draw_row.ellipse(
-                    ((ctx['ROW_WIDTH'] - 5 * SPACING - radius) // 2, (row_height - radius) // 2,
-                     (ctx['ROW_WIDTH'] - 5 * SPACING + radius) // 2, (row_height + radius) // 2),
-                    fill=(209, 222, 241, 255))
-                draw_row.ellipse(
-                    ((ctx['ROW_WIDTH'] + 5 * SPACING - radius) // 2, (row_height - radius) // 2,
-                     (ctx['ROW_WIDTH'] + 5 * SPACING + radius) // 2, (row_height + radius) // 2),
-                    fill=(209, 222, 241, 255))
+    @property
+    def snapshot(self) -> Optional[PodiumSnapshot]:
+        snapshot = Podium._snapshots.get(type(self))
+        if snapshot and time.time() - snapshot.taken < LEADERBOARD_SNAPSHOT_MAX_AGE:
+            return snapshot
+
+    @classmethod
+    async def refresh_snapshot(cls):
+        """Prepares the podium as seen by someone outside of it, for later renders to build on"""
+        podium = cls()
+        await podium.prepare_target()
+
+        Podium._snapshots[cls] = PodiumSnapshot(time.time(), await podium.prepare_leaderboard())
 
-                rows.append(image_row)
-                rows.append((await self.render_row({**ctx, 'POSITION': self._target_position + 1},
-                                                   self._target_player_info)).image)
+    async def prepare_from_snapshot(self, snapshot: PodiumSnapshot) -> dict:
+        rows = 5 if self._target_position < 8 else 4
 
-            return rows
+        target_entry = None
+        if self._target_position >= 8:
+            await hydrate([self._target_player_info], 'PlayerInfo', *self.hydrate_schemas)
+            target_entry = await self.row_data(self._target_player_info, LEADERBOARD_PODIUM_ROW_SCALE)
 
+        return {
+            **snapshot.data,
+            'entries': snapshot.data['entries'][:rows],
+            'target_entry': target_entry,
+            'target_position': self._target_position,
+            # only the snapshot is sent, its drawn parts are kept by the render processes
+            'snapshot': snapshot.taken,
+        }
+
+    async def prepare_target(self):
         self._target_position = -1
         if self._username or self._discord_user:
             try:
@@ -109,55 +155,95 @@ class Podium(Renderable):
             except DiscordNotLinkedError:
                 pass
 
+    async def prepare_leaderboard(self) -> dict:
         try:
             leaderboard_highlight = [await self._data.__anext__() for i in range(3)]
         except StopAsyncIteration:
             raise NotEnoughDataError()
 
+        rows_data = [x async for x in a.islice(self._data, 5 if self._target_position < 8 else 4)]
+
+        await hydrate([*leaderboard_highlight, *rows_data,
+                       self._target_player_info if self._target_position != -1 else None],
+                      'PlayerInfo', *self.hydrate_schemas)
+
+        shown = [*zip(leaderboard_highlight, LEADERBOARD_PODIUM_HIGHLIGHT_SCALES),
+                 *((player_info, LEADERBOARD_PODIUM_ROW_SCALE) for player_info in rows_data)]
+        if self._target_position >= 8:
+            shown.append((self._target_player_info, LEADERBOARD_PODIUM_ROW_SCALE))
+
+        rows = await asyncio.gather(*(self.row_data(player_info, scale) for player_info, scale in shown))
+
+        return {
+            'display_name': self._display_name,
+            'highlight': rows[:3],
+            'entries': rows[3:3 + len(rows_data)],
+            'target_entry': rows[-1] if self._target_position >= 8 else None,
+            'target_position': self._target_position,
+        }
+
+    async def prewarm(self) -> List[str]:
+        """Caches the avatars of the players currently on the podium, returning their uuids"""
+        scales = [*LEADERBOARD_PODIUM_HIGHLIGHT_SCALES, *[LEADERBOARD_PODIUM_ROW_SCALE] * 5]
+        leaderboard = [x async for x in a.islice(self._data, len(scales))]
+        await hydrate(leaderboard, 'PlayerInfo')
+
+        uuids = []
+        for player_info, scale in zip(leaderboard, scales):
+            try:
+                uuid = await player_info.uuid
+                await Avatar(uuid, scale).prepare()
+                uuids.append(uuid)
+            except Exception as e:
+                # a player without a skin should not keep the rest of the podium from being cached
+                sentry_sdk.capture_exception(e)
+
+        return uuids
+
+    @staticmethod
+    def position_length(target_position: int) -> int:
+        return max(round(text_length(FONT_BLACK, 24, f'#{target_position}')), 4 * SPACING)
+
+    @staticmethod
+    def draw_highlight(display_name: str, highlight: List[dict]) -> Render:
         image_highlight = Image.new('RGBA', (LEADERBOARD_PODIUM_WIDTH, LEADERBOARD_PODIUM_HEIGHT + SPACING),
                                     color=(0, 0, 0, 0))
         draw_highlight = ImageDraw.Draw(image_highlight)
 
-        font_title = ImageFont.truetype(FONT_BOLD, 36)
-        font_subtitle = ImageFont.truetype(FONT_BOLD, 18)
+        font_title = get_font(FONT_BOLD, 36)
+        font_subtitle = get_font(FONT_BOLD, 18)
 
-        bounds_title = draw_highlight.textbbox((0, 56), self._display_name.upper(), font_title)
+        bounds_title = text_bbox(FONT_BOLD, 36, display_name.upper(), (0, 56))
         draw_highlight.text(((LEADERBOARD_PODIUM_WIDTH - bounds_title[2]) // 2, 56),
-                            self._display_name.upper(), (255, 255, 255, 255), font_title)
+                            display_name.upper(), (255, 255, 255, 255), font_title)
 
-        length_subtitle = draw_highlight.textlength('LEADERBOARD', font_subtitle)
+        length_subtitle = text_length(FONT_BOLD, 18, 'LEADERBOARD')
         draw_highlight.text(((LEADERBOARD_PODIUM_WIDTH - length_subtitle) // 2, bounds_title[3] + SPACING),
                             'LEADERBOARD', (255, 255, 255, 255), font_subtitle)
 
-        image_avatar_big = (await Avatar(await leaderboard_highlight[0].uuid, 10).render()).image
+        image_avatar_big = Avatar.draw(**highlight[0]['avatar']).image
         image_highlight.paste(image_avatar_big, (270 - image_avatar_big.width // 2, 177))
 
-        image_avatar_two = (await Avatar(await leaderboard_highlight[1].uuid, 7).render()).image
+        image_avatar_two = Avatar.draw(**highlight[1]['avatar']).image
         image_highlight.paste(image_avatar_two, (93 - image_avatar_two.width // 2, 225))
 
-        image_avatar_three = (await Avatar(await leaderboard_highlight[2].uuid, 7).render()).image
+        image_avatar_three = Avatar.draw(**highlight[2]['avatar']).image
         image_highlight.paste(image_avatar_three, (449 - image_avatar_three.width // 2, 235))
 
-        font_highlight_big = ImageFont.truetype(FONT_BOLD, 24)
-        font_highlight_med = ImageFont.truetype(FONT_BOLD, 18)
+        font_highlight_big = get_font(FONT_BOLD, 24)
+        font_highlight_med = get_font(FONT_BOLD, 18)
 
-        draw_highlight.text((270, 270), await leaderboard_highlight[0].username,
-                            (212, 175, 55, 255) if self._target_position != -1 and (
-                                await leaderboard_highlight[0].username) == (
-                                                       await self._target_player_info.username) else (
-                                255, 255, 255, 255), font_highlight_big, anchor='mt')
+        draw_highlight.text((270, 270), highlight[0]['username'],
+                            (212, 175, 55, 255) if highlight[0]['highlighted'] else (255, 255, 255, 255),
+                            font_highlight_big, anchor='mt')
 
-        draw_highlight.text((93, 298), await leaderboard_highlight[1].username,
-                            (212, 175, 55, 255) if self._target_position != -1 and (
-                                await leaderboard_highlight[1].username) == (
-                                                       await self._target_player_info.username) else (
-                                255, 255, 255, 255), font_highlight_med, anchor='mt')
+        draw_highlight.text((93, 298), highlight[1]['username'],
+                            (212, 175, 55, 255) if highlight[1]['highlighted'] else (255, 255, 255, 255),
+                            font_highlight_med, anchor='mt')
 
-        draw_highlight.text((449, 308), await leaderboard_highlight[2].username,
-                            (212, 175, 55, 255) if self._target_position != -1 and (
-                                await leaderboard_highlight[2].username) == (
-                                                       await self._target_player_info.username) else (
-                                255, 255, 255, 255), font_highlight_med, anchor='mt')
+        draw_highlight.text((449, 308), highlight[2]['username'],
+                            (212, 175, 55, 255) if highlight[2]['highlighted'] else (255, 255, 255, 255),
+                            font_highlight_med, anchor='mt')
 
         draw_highlight.polygon([(210, LEADERBOARD_PODIUM_HEIGHT + SPACING),
                                 (163, 392),
@@ -172,35 +258,101 @@ class Podium(Renderable):
                                 (388, 344),
                                 (355, LEADERBOARD_PODIUM_HEIGHT + SPACING)], fill=(158, 205, 187))
 
-        font_stats_big = ImageFont.truetype(FONT_BLACK, 48)
-        font_stats_med = ImageFont.truetype(FONT_BLACK, 36)
+        font_stats_big = get_font(FONT_BLACK, 48)
+        font_stats_med = get_font(FONT_BLACK, 36)
 
-        length_stats_big = draw_highlight.textlength(await self.get_stats(leaderboard_highlight[0]), font_stats_big)
+        length_stats_big = text_length(FONT_BLACK, 48, highlight[0]['stats'])
         draw_highlight.text((270 - length_stats_big // 2, 368),
-                            await self.get_stats(leaderboard_highlight[0]), (14, 14, 38, 255), font_stats_big)
+                            highlight[0]['stats'], (14, 14, 38, 255), font_stats_big)
 
-        length_stats_two = draw_highlight.textlength(await self.get_stats(leaderboard_highlight[1]), font_stats_med)
+        length_stats_two = text_length(FONT_BLACK, 36, highlight[1]['stats'])
         draw_highlight.text((117 - length_stats_two // 2, 400),
-                            await self.get_stats(leaderboard_highlight[1]), (14, 14, 38, 255), font_stats_med)
+                            highlight[1]['stats'], (14, 14, 38, 255), font_stats_med)
 
-        length_stats_three = draw_highlight.textlength(await self.get_stats(leaderboard_highlight[2]), font_stats_med)
+        length_stats_three = text_length(FONT_BLACK, 36, highlight[2]['stats'])
         draw_highlight.text((424 - length_stats_three // 2, 415),
-                            await self.get_stats(leaderboard_highlight[2]), (14, 14, 38, 255), font_stats_med)
+                            highlight[2]['stats'], (14, 14, 38, 255), font_stats_med)
+
+        return Render(image_highlight)
+
+    @classmethod
+    def draw_entries(cls, ctx, entries: List[dict],
+                     drawn: Optional[Dict[int, Image.Image]] = None) -> List[Image.Image]:
+        """Draws the rows below the podium, reusing and adding to drawn, rows by index already drawn in this layout"""
+        if drawn is None:
+            drawn = {}
+
+        for i, entry in enumerate(entries):
+            if i not in drawn:
+                drawn[i] = cls.draw_row({**ctx, 'POSITION': i + 4}, **entry).image
+
+        return [drawn[i] for i in range(len(entries))]
+
+    @classmethod
+    def prerendered(cls, snapshot: float, display_name: str, highlight: List[dict]) -> dict:
+        """The parts of a snapshot every caller outside of the podium shares, as drawn by this process"""
+        prerendered = Podium._prerendered.get(cls)
+        if prerendered is None or prerendered['taken'] != snapshot:
+            prerendered = Podium._prerendered[cls] = {
+                'taken': snapshot,
+                'highlight': cls.draw_highlight(display_name, highlight).image,
+                # rows by the row width and position column width they were drawn at
+                'rows': LRUCache(LEADERBOARD_SNAPSHOT_LAYOUTS),
+            }
+
+        return prerendered
+
+    @classmethod
+    def draw(cls, display_name: str, highlight: List[dict], entries: List[dict], target_entry: Optional[dict],
+             target_position: int, snapshot: Optional[float] = None) -> Render:
+        def get_rows():
+            drawn = None
+            if prerendered:
+                drawn = prerendered['rows'].setdefault((ctx['ROW_WIDTH'], ctx['POSITION_LENGTH']), {})
+
+            images = cls.draw_entries(ctx, entries, drawn)
+
+            if target_entry:
+                row_height = 30
+                radius = 10
 
-        self._font_position = ImageFont.truetype(FONT_BLACK, 24)
-        self._font_stats = ImageFont.truetype(FONT_BOLD, 18)
+                image_row = Image.new('RGBA', (ctx['ROW_WIDTH'], row_height), color=(0, 0, 0, 0))
+                draw_row = ImageDraw.Draw(image_row)
+                draw_row.ellipse(
+                    ((ctx['ROW_WIDTH'] - radius) // 2, (row_height - radius) // 2,
+                     (ctx['ROW_WIDTH'] + radius) // 2, (row_height + radius) // 2), fill=(209, 222, 241, 255))
+                draw_row.ellipse(
+                    ((ctx['ROW_WIDTH'] - 5 * SPACING - radius) // 2, (row_height - radius) // 2,
+                     (ctx['ROW_WIDTH'] - 5 * SPACING + radius) // 2, (row_height + radius) // 2),
+                    fill=(209, 222, 241, 255))
+                draw_row.ellipse(
+                    ((ctx['ROW_WIDTH'] + 5 * SPACING - radius) // 2, (row_height - radius) // 2,
+                     (ctx['ROW_WIDTH'] + 5 * SPACING + radius) // 2, (row_height + radius) // 2),
+                    fill=(209, 222, 241, 255))
 
-        self._position_length = max(round(draw_highlight.textlength(f'#{self._target_position}', self._font_position)),
-                                    4 * SPACING)
+                images.append(image_row)
+                images.append(cls.draw_row({**ctx, 'POSITION': target_position + 1}, **target_entry).image)
 
-        ctx = {'ROW_WIDTH': image_highlight.width}
-        rows_data = [x async for x in a.islice(self._data, 5 if self._target_position < 8 else 4)]
-        rows = await get_rows()
+            return images
+
+        if snapshot is not None:
+            prerendered = cls.prerendered(snapshot, display_name, highlight)
+            image_highlight = prerendered['highlight']
+        else:
+            prerendered = None
+            image_highlight = cls.draw_highlight(display_name, highlight).image
 
+        ctx = {
+            'ROW_WIDTH': image_highlight.width,
+            'POSITION_LENGTH': cls.position_length(target_position),
+        }
+
+        # every row is measured first, so that all of them are drawn once at the width of the widest
+        ctx['ROW_WIDTH'] = max([ctx['ROW_WIDTH'], *(int(cls.row_width(ctx, **entry))
+                                                    for entry in [*entries, *([target_entry] if target_entry else [])])])
+
+        rows = get_rows()
         rows_width = max(row.width for row in rows)
-        if rows_width > ctx['ROW_WIDTH']:
-            ctx['ROW_WIDTH'] = rows_width
-            rows = await get_rows()
 
         image_base = Image.new('RGBA', (rows_width,
                                         LEADERBOARD_PODIUM_HEIGHT + sum(row.height + SPACING for row in rows)),
@@ -221,6 +373,8 @@ class Podium(Renderable):
 
 
 class RankPodium(Podium):
+    hydrate_schemas = ['PlayerStatsPrison']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardRank, 'Rank', Privacy.prison)
 
@@ -229,6 +383,8 @@ class RankPodium(Podium):
 
 
 class KdaPodium(Podium):
+    hydrate_schemas = ['PlayerStatsArena']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardKda, 'Kda', Privacy.arena)
 
@@ -237,6 +393,8 @@ class KdaPodium(Podium):
 
 
 class KillsPodium(Podium):
+    hydrate_schemas = ['PlayerStatsArena']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardKills, 'Kills', Privacy.arena)
 
@@ -245,6 +403,8 @@ class KillsPodium(Podium):
 
 
 class BlocksPodium(Podium):
+    hydrate_schemas = ['PlayerStatsPrison']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardBlocks, 'Blocks', Privacy.prison)
 
@@ -253,6 +413,8 @@ class BlocksPodium(Podium):
 
 
 class InfamyPodium(Podium):
+    hydrate_schemas = ['PlayerStatsArena']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardInfamy, 'Infamy', Privacy.arena)
 
@@ -261,6 +423,8 @@ class InfamyPodium(Podium):
 
 
 class DeathsPodium(Podium):
+    hydrate_schemas = ['PlayerStatsArena']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardDeaths, 'Deaths', Privacy.arena)
 
@@ -269,6 +433,8 @@ class DeathsPodium(Podium):
 
 
 class MoneyPodium(Podium):
+    hydrate_schemas = ['PlayerBalance']
+
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
         super().__init__(username, discord_user, Leaderboard.LeaderboardMoney, 'Money', Privacy.balance)
 
@@ -1,50 +1,165 @@
+import asyncio
+import functools
+import json
 from io import BytesIO
-from typing import Generator
+from typing import Callable, Dict, Generator, NamedTuple, Optional, Set, Tuple
 
+import sentry_sdk
 from PIL import Image
 
-from helpers.pil_transparent_gifs import save_transparent_gif
+from bot.card.RenderCache import RenderCache
+from bot.card.RenderExecutor import RenderExecutor
+from helpers.gif import save_indexed_gif, save_transparent_gif
+
+# encodings being written to the render cache, referenced until they are stored
+_cache_puts: Set[asyncio.Future] = set()
+
+
+def _cache_put_done(future: asyncio.Future):
+    _cache_puts.discard(future)
+
+    if not future.cancelled() and (e := future.exception()):
+        sentry_sdk.capture_exception(e)
+
+
+class Encoding(NamedTuple):
+    """A file a render is encoded to, as the name of the Render method making it and its arguments"""
+    method: str
+    args: tuple
+    kwargs: dict
+
+    @property
+    def key(self) -> str:
+        return f'{self.method}:{json.dumps([self.args, self.kwargs], sort_keys=True)}'
+
+
+def draw_encoded(draw: Callable[[], 'Render'], still: Encoding, animated: Encoding) -> Tuple[bytes, bool]:
+    """Draws a render and encodes it as still or animated, whichever it turns out to be, so that only the encoded
+    file leaves the render pool"""
+    render = draw()
+    return render.encoded(animated if render.animated else still), render.animated
 
 
 class Render:
     def __init__(self, *images: Image.Image, **attributes):
         self._images = images
         self._attributes = attributes
+        self._files = {}
+        self.cache_key = None
+        self._animated = None
+        self._redraw = None
 
     def __getattr__(self, attr: str):
         try:
-            return self._attributes[attr]
+            return self.__dict__['_attributes'][attr]
         except KeyError:
             raise AttributeError()
 
+    @classmethod
+    def deferred(cls, key: str, draw: Callable[[], 'Render'], files: Dict[str, bytes] = None,
+                 animated: Optional[bool] = None) -> 'Render':
+        """A render that is only drawn, in the render pool, when asked for a file it does not have yet"""
+        render = cls()
+        render._files = files or {}
+        render.cache_key = key
+        render._animated = animated
+        render._redraw = draw
+
+        return render
+
     @property
     def image(self) -> Image.Image:
-        return self._images[0]
+        return self.frames[0]
 
     @property
     def animated(self) -> bool:
+        """Whether this render has more than one frame, which a deferred render only knows once drawn or encoded"""
+        if self._animated is not None:
+            return self._animated
         return len(self._images) > 1
 
+    @property
+    def frames(self) -> Tuple[Image.Image, ...]:
+        return self._images
+
+    async def drawn(self) -> 'Render':
+        """This render with its frames, drawing a deferred render if it has none"""
+        if not self._images and self._redraw:
+            redrawn = await RenderExecutor().run(self._redraw)
+            self._images = redrawn._images
+            self._attributes = redrawn._attributes
+
+        return self
+
     @property
     def images(self) -> Generator[Image.Image, None, None]:
-        yield from self._images
+        yield from self.frames
 
-    def file(self, *args, **kwargs) -> BytesIO:
+    def encoded(self, encoding: Encoding) -> bytes:
         fp = BytesIO()
-        self.image.save(fp, *args, **kwargs)
-        fp.seek(0)
 
-        return fp
+        if encoding.method == 'file_animated':
+            # renders may come with their frames already quantized, as a palette and palette indices
+            quantized = self._attributes.get('quantized')
+            if quantized and not {'alpha_threshold', 'matte'} & encoding.kwargs.keys():
+                save_indexed_gif(*quantized, 1, fp, **encoding.kwargs)
+            else:
+                save_transparent_gif(self.frames, 1, fp, **encoding.kwargs)
+        else:
+            self.image.save(fp, *encoding.args, **encoding.kwargs)
 
-    def file_animated(self, *args, **kwargs) -> BytesIO:
-        fp = BytesIO()
-        save_transparent_gif(self._images, 1, fp, **kwargs)
-        # self.image.save(fp, save_all=True, append_images=self._images[1:], *args, **kwargs)
-        fp.seek(0)
+        return fp.getvalue()
+
+    async def encode(self, still: Encoding, animated: Encoding) -> Tuple[BytesIO, bool]:
+        """The file of this render, encoded as still or as animated, and whether it is animated
+
+        Encoding happens in the render pool, together with drawing for a render that has not been drawn yet.
+        """
+        if self._images or self._animated is not None:
+            encoding = animated if self.animated else still
+            if encoding.key in self._files:
+                return BytesIO(self._files[encoding.key]), self.animated
+
+        if self._images:
+            data = await RenderExecutor().run(self.encoded, encoding)
+        else:
+            data, self._animated = await RenderExecutor().run(draw_encoded, self._redraw, still, animated)
+            encoding = animated if self._animated else still
+
+        self._files[encoding.key] = data
+
+        if self.cache_key:
+            future = asyncio.ensure_future(RenderCache().put(self.cache_key, encoding.key, data, self.animated))
+            _cache_puts.add(future)
+            future.add_done_callback(_cache_put_done)
+
+        return BytesIO(data), self.animated
+
+    async def file(self, *args, **kwargs) -> BytesIO:
+        encoding = Encoding('file', args, kwargs)
+        return (await self.encode(encoding, encoding))[0]
 
-        return fp
+    async def file_animated(self, *args, **kwargs) -> BytesIO:
+        encoding = Encoding('file_animated', args, kwargs)
+        return (await self.encode(encoding, encoding))[0]
+
+    async def file_auto(self, still: dict, animated: dict) -> Tuple[BytesIO, bool]:
+        """The file of this render, encoded with the keyword arguments of file if it is still or of file_animated if
+        it is animated, and whether it is animated"""
+        return await self.encode(Encoding('file', (), still), Encoding('file_animated', (), animated))
 
 
 class Renderable:
-    async def render(self) -> Render:
+    async def prepare(self) -> dict:
+        """Gathers everything the drawing phase needs, as picklable keyword arguments to draw"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def draw(**data) -> Render:
         raise NotImplementedError()
+
+    async def render(self) -> Render:
+        data = await self.prepare()
+        key = RenderCache.key(self, data)
+
+        return Render.deferred(key, functools.partial(self.draw, **data), *(await RenderCache().get(key) or ()))
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import pickle
+import time
+from typing import Dict, Optional, Tuple
+
+from bot.config import env
+from helpers.utilities import SingletonBase
+from store.RedisClient import RedisClient
+
+RENDER_CACHE_TTL = int(os.environ.get('RENDER_CACHE_TTL', 3600))
+RENDER_CACHE_MAX_BYTES = int(os.environ.get('RENDER_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RENDER_CACHE_MAX_ENTRY_BYTES = int(os.environ.get('RENDER_CACHE_MAX_ENTRY_BYTES', 4 * 1024 * 1024))
+
+INDEX_KEY = 'render:index'
+SIZES_KEY = 'render:sizes'
+TOTAL_KEY = 'render:total'
+EVICT_BATCH = 16
+
+
+class RenderCache(SingletonBase):
+    """Encoded card images in Redis, keyed by card class and the data it was drawn from
+
+    Entries expire after RENDER_CACHE_TTL seconds without a hit, and the least recently used ones are evicted
+    once their total size exceeds RENDER_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self):
+        self._hits = 0
+        self._misses = 0
+        self._stored = 0
+        self._evicted = 0
+        self._total_synced = False
+
+    @staticmethod
+    def key(renderable, data: dict) -> str:
+        cls = renderable.__class__
+        fingerprint = pickle.dumps((env.get('VERSION'), cls.__module__, cls.__qualname__, data), protocol=4)
+        return hashlib.md5(fingerprint).hexdigest()
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, bytes], bool]]:
+        conn = RedisClient().conn
+
+        if not (entry := await conn.hgetall(f'render:{key}')):
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        async with conn.pipeline(transaction=False) as pipe:
+            pipe.zadd(INDEX_KEY, {key: time.time()})
+            pipe.expire(f'render:{key}', RENDER_CACHE_TTL)
+            await pipe.execute()
+
+        animated = entry.pop(b'animated', b'0') == b'1'
+        return {encoding.decode(): data for encoding, data in entry.items()}, animated
+
+    async def put(self, key: str, encoding: str, data: bytes, animated: bool):
+        if len(data) > RENDER_CACHE_MAX_ENTRY_BYTES:
+            return
+
+        conn = RedisClient().conn
+        async with conn.pipeline(transaction=True) as pipe:
+            pipe.hset(f'render:{key}', mapping={encoding: data, 'animated': int(animated)})
+            pipe.expire(f'render:{key}', RENDER_CACHE_TTL)
+            pipe.zadd(INDEX_KEY, {key: time.time()})
+            pipe.hincrby(SIZES_KEY, key, len(data))
+            pipe.incrby(TOTAL_KEY, len(data))
+            *_, total = await pipe.execute()
+
+        self._stored += 1
+        await self._trim(total)
+
+    async def _drop(self, keys) -> int:
+        """Removes entries and returns the total size of those left"""
+        conn = RedisClient().conn
+        sizes = await conn.hmget(SIZES_KEY, *keys)
+
+        async with conn.pipeline(transaction=True) as pipe:
+            pipe.delete(*(f'render:{key.decode()}' for key in keys))
+            pipe.zrem(INDEX_KEY, *keys)
+            pipe.hdel(SIZES_KEY, *keys)
+            pipe.decrby(TOTAL_KEY, sum(int(size or 0) for size in sizes))
+            *_, total = await pipe.execute()
+
+        return total
+
+    async def _trim(self, total: int):
+        conn = RedisClient().conn
+
+        if not self._total_synced:
+            # the running total starts from the sizes themselves once per process, which also corrects any drift
+            total = sum(int(size) for size in await conn.hvals(SIZES_KEY))
+            await conn.set(TOTAL_KEY, total)
+            self._total_synced = True
+
+        # entries Redis has already expired still need to leave the index
+        if expired := await conn.zrangebyscore(INDEX_KEY, '-inf', time.time() - RENDER_CACHE_TTL):
+            total = await self._drop(expired)
+
+        while total > RENDER_CACHE_MAX_BYTES:
+            if not (oldest := await conn.zrange(INDEX_KEY, 0, EVICT_BATCH - 1)):
+                break
+
+            total = await self._drop(oldest)
+            self._evicted += len(oldest)
+
+    @property
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': self._hits / lookups if lookups else 0.0,
+            'stored': self._stored,
+            'evicted': self._evicted,
+        }
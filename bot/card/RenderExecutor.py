@@ -0,0 +1,75 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from bot.card.fonts import preload_fonts
+from helpers.utilities import SingletonBase
+
+RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', os.cpu_count() or 1))
+
+
+def run_timed(fn, args, kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class RenderExecutor(SingletonBase):
+    def __init__(self):
+        self._executor = None
+        self._pending = 0
+        self._rendered = 0
+        self._render_time_total = 0.0
+        self._render_time_max = 0.0
+        self._wait_time_total = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(RENDER_WORKERS, initializer=preload_fonts)
+
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs a pure drawing function, with picklable arguments, in the render process pool"""
+        start = time.perf_counter()
+        self._pending += 1
+
+        try:
+            if RENDER_WORKERS:
+                result, render_time = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, run_timed, fn, args, kwargs)
+            else:
+                result, render_time = run_timed(fn, args, kwargs)
+        except BrokenProcessPool:
+            # a worker died, start over with a fresh pool on the next render
+            self._executor = None
+            raise
+        finally:
+            self._pending -= 1
+
+        self._rendered += 1
+        self._render_time_total += render_time
+        self._render_time_max = max(self._render_time_max, render_time)
+        self._wait_time_total += time.perf_counter() - start - render_time
+
+        return result
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'workers': RENDER_WORKERS,
+            'queue_depth': self._pending,
+            'rendered': self._rendered,
+            'render_time_avg': self._render_time_total / self._rendered if self._rendered else 0.0,
+            'render_time_max': self._render_time_max,
+            'wait_time_avg': self._wait_time_total / self._rendered if self._rendered else 0.0,
+        }
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+        self._executor = None
@@ -1,10 +1,10 @@
-import asyncio
-
 import math
-from PIL import Image, ImageDraw, ImageFont
+from typing import List
+
+from PIL import Image, ImageDraw
 
 from bot.card.Render import Render, Renderable
-from bot.card.card import FONT_BLACK, FONT_REGULAR
+from bot.card.fonts import FONT_BLACK, FONT_REGULAR, get_font
 from bot.coloreffect import ColorEffect
 
 RIBBON_WIDTH = 215
@@ -13,6 +13,7 @@ RIBBON_HEIGHT = 35
 
 class Ribbon(Renderable):
     def __init__(self, title):
+        self._title = title
         self._text = str(title)
         self._color = title.color
         self._bold = getattr(title, 'bold', False)
@@ -26,21 +27,25 @@ class Ribbon(Renderable):
         image_foreground = Image.new('RGBA', background.size, (0, 0, 0, 0))
         draw_foreground = ImageDraw.Draw(image_foreground)
 
-        font_ribbon = ImageFont.truetype(FONT_BLACK if self._bold else FONT_REGULAR, 18)
+        font_ribbon = get_font(FONT_BLACK if self._bold else FONT_REGULAR, 18)
         draw_foreground.text((image_foreground.width // 2, image_foreground.height // 2),
                              self._text, self._font.rgba(n), font_ribbon, anchor='mm')
         return image_foreground
 
-    async def render(self) -> Render:
-        loop = asyncio.get_running_loop()
+    def render_frames(self) -> List[Image.Image]:
+        frames = []
+        for i in range(self._color.duration):
+            image_background = self.render_background(i)
+            frames.append(Image.alpha_composite(image_background, self.render_foreground(image_background, i)))
+
+        return frames
 
-        a = zip(backgrounds := await asyncio.gather(*(loop.run_in_executor(None, self.render_background, i)
-                                                      for i in range(self._color.duration))),
-                await asyncio.gather(*(loop.run_in_executor(None, self.render_foreground, backgrounds[i], i)
-                                       for i in range(self._color.duration))))
+    async def prepare(self) -> dict:
+        return {'title': self._title}
 
-        frames = [Image.alpha_composite(image_background, image_foreground) for image_background, image_foreground in a]
-        return Render(*frames)
+    @classmethod
+    def draw(cls, title) -> Render:
+        return Render(*cls(title).render_frames())
 
 
 class RibbonShine(Ribbon):
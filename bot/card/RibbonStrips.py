@@ -0,0 +1,87 @@
+import hashlib
+import inspect
+import os
+from typing import Dict, List
+
+import numpy as np
+import PIL
+from PIL import Image
+
+from bot import coloreffect
+from bot.card import Ribbon, fonts
+from helpers.utilities import SingletonBase
+
+RIBBON_BUNDLE_DIR = os.environ.get('RIBBON_BUNDLE_DIR', 'build/ribbons')
+
+# the ribbon is turned to run across the top right corner of a stats card, and cut to fit inside it
+RIBBON_STRIP_ANGLE = -35
+RIBBON_STRIP_BOX = (0, 30, 164, 220)
+
+
+def cut_ribbon(image: Image.Image) -> Image.Image:
+    return image.rotate(RIBBON_STRIP_ANGLE, expand=True).crop(RIBBON_STRIP_BOX)
+
+
+class RibbonStrips(SingletonBase):
+    """Finished ribbon frames for every known title, in an on-disk bundle that is memory-mapped on first use
+
+    The bundle lives in a directory named after everything the frames are drawn from, so a change to any
+    title, color effect or ribbon style makes build() draw a fresh one instead of reusing stale frames.
+    """
+
+    def __init__(self):
+        self._strips: Dict[str, np.ndarray] = {}
+        self._loaded = False
+
+    @staticmethod
+    def fingerprint() -> str:
+        from bot.cosmetics import titles
+
+        digest = hashlib.md5(repr((PIL.__version__, RIBBON_STRIP_ANGLE, RIBBON_STRIP_BOX)).encode())
+        for module in (titles, Ribbon, coloreffect, fonts):
+            with open(inspect.getsourcefile(module), 'rb') as f:
+                digest.update(f.read())
+
+        return digest.hexdigest()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(RIBBON_BUNDLE_DIR, self.fingerprint())
+
+    def build(self):
+        from bot.cosmetics import titles
+
+        path = self.path
+        os.makedirs(path, exist_ok=True)
+
+        for title_id, title in titles.known_titles.items():
+            if os.path.exists(strip_path := os.path.join(path, f'{title_id}.npy')):
+                continue
+
+            frames = [cut_ribbon(image) for image in getattr(title, 'ribbon', Ribbon.Ribbon).draw(title).images]
+            with open(f'{strip_path}.{os.getpid()}', 'wb') as f:
+                np.save(f, np.stack([np.asarray(frame.convert('RGBA')) for frame in frames]))
+            os.replace(f'{strip_path}.{os.getpid()}', strip_path)
+
+    def load(self):
+        self._loaded = True
+        if not os.path.isdir(path := self.path):
+            return
+
+        for filename in os.listdir(path):
+            if filename.endswith('.npy'):
+                self._strips[filename[:-len('.npy')]] = np.load(os.path.join(path, filename), mmap_mode='r')
+
+    def frames(self, title) -> List[Image.Image]:
+        if not self._loaded:
+            self.load()
+
+        if (strip := self._strips.get(title.id)) is not None:
+            return [Image.fromarray(np.asarray(frame), 'RGBA') for frame in strip]
+
+        # titles missing from the bundle are drawn on the spot
+        return [cut_ribbon(image) for image in getattr(title, 'ribbon', Ribbon.Ribbon).draw(title).images]
+
+
+if __name__ == '__main__':
+    RibbonStrips().build()
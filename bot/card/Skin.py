@@ -0,0 +1,94 @@
+import os
+from io import BytesIO
+from typing import NamedTuple, Optional, Tuple
+
+from cachetools import LRUCache, cached
+from PIL import Image
+
+SKIN_CACHE_MAX_BYTES = int(os.environ.get('SKIN_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+
+class Skin(NamedTuple):
+    uuid: str
+    texture: str
+    data: bytes
+    slim: bool
+
+    @property
+    def parts(self) -> 'SkinParts':
+        return decode_skin(self)
+
+
+def _visible(image: Image.Image, box: Tuple[int, int, int, int]) -> bool:
+    return image.crop(box).getextrema()[3][0] < 255
+
+
+def _layered(image: Image.Image, box: Tuple[int, int, int, int],
+             overlay: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+    part = image.crop(box)
+    if overlay:
+        part.alpha_composite(image.crop(overlay))
+    return part
+
+
+class SkinParts:
+    """A decoded skin split into its faces, at texture resolution, with visible overlay layers already applied"""
+
+    def __init__(self, image: Image.Image, slim: bool):
+        image = image.convert('RGBA')
+        self.old = image.height == 32
+        self.arm_width = arm_width = 3 if slim else 4
+
+        hat = _visible(image, (32, 0, 64, 32))
+        self.head_top = _layered(image, (8, 0, 16, 8), hat and (40, 0, 48, 8))
+        self.head_front = _layered(image, (8, 8, 16, 16), hat and (40, 8, 48, 16))
+        self.head_right = _layered(image, (0, 8, 8, 16), hat and (32, 8, 40, 16))
+
+        if self.old:
+            self.body_front = image.crop((20, 20, 28, 32))
+            self.arm_right_top = image.crop((44, 16, 44 + arm_width, 20))
+            self.arm_right_front = image.crop((44, 20, 44 + arm_width, 32))
+            self.arm_right_side = image.crop((40, 20, 44, 32))
+            self.arm_left_top = self.arm_right_top.transpose(method=Image.FLIP_LEFT_RIGHT)
+            self.arm_left_front = self.arm_right_front.transpose(method=Image.FLIP_LEFT_RIGHT)
+            self.leg_right_front = image.crop((4, 20, 8, 32))
+            self.leg_right_side = image.crop((0, 20, 4, 32))
+            self.leg_left_front = self.leg_right_front.transpose(method=Image.FLIP_LEFT_RIGHT)
+            return
+
+        jacket = _visible(image, (16, 32, 48, 48))
+        self.body_front = _layered(image, (20, 20, 28, 32), jacket and (20, 36, 28, 48))
+
+        sleeve_right = _visible(image, (48, 48, 64, 64))
+        self.arm_right_top = _layered(image, (44, 16, 44 + arm_width, 20),
+                                      sleeve_right and (44, 32, 44 + arm_width, 36))
+        self.arm_right_front = _layered(image, (44, 20, 44 + arm_width, 32),
+                                        sleeve_right and (44, 36, 44 + arm_width, 48))
+        self.arm_right_side = _layered(image, (40, 20, 44, 32), sleeve_right and (40, 36, 44, 48))
+
+        sleeve_left = _visible(image, (40, 32, 56, 48))
+        self.arm_left_top = _layered(image, (36, 48, 36 + arm_width, 52),
+                                     sleeve_left and (52, 48, 52 + arm_width, 52))
+        self.arm_left_front = _layered(image, (36, 52, 36 + arm_width, 64),
+                                       sleeve_left and (52, 52, 52 + arm_width, 64))
+
+        pants_right = _visible(image, (0, 32, 16, 48))
+        self.leg_right_front = _layered(image, (4, 20, 8, 32), pants_right and (4, 36, 8, 48))
+        self.leg_right_side = _layered(image, (0, 20, 4, 32), pants_right and (0, 36, 4, 48))
+
+        self.leg_left_front = _layered(image, (20, 52, 24, 64), _visible(image, (0, 48, 16, 64)) and (4, 52, 8, 64))
+
+    def scaled(self, part: str, scale: int) -> Image.Image:
+        image = getattr(self, part)
+        return image.resize((image.width * scale, image.height * scale), Image.NEAREST)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(4 * part.width * part.height for part in vars(self).values() if isinstance(part, Image.Image))
+
+
+# Decoded skins are kept per process, so that each render worker only decodes a skin once
+@cached(cache=LRUCache(maxsize=SKIN_CACHE_MAX_BYTES, getsizeof=lambda parts: parts.nbytes),
+        key=lambda skin: (skin.uuid, skin.texture, skin.slim))
+def decode_skin(skin: Skin) -> SkinParts:
+    return SkinParts(Image.open(BytesIO(skin.data)), skin.slim)
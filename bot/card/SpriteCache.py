@@ -0,0 +1,88 @@
+import os
+from io import BytesIO
+from typing import Callable, Dict, NamedTuple, Tuple
+
+from cachetools import LRUCache
+from PIL import Image
+
+from bot.card.Render import Render
+from bot.card.RenderExecutor import RenderExecutor
+from bot.card.Skin import Skin
+from helpers.utilities import SingletonBase
+from store.RedisClient import RedisClient
+
+SPRITE_CACHE_TTL = int(os.environ.get('SPRITE_CACHE_TTL', 86400))
+SPRITE_CACHE_MAX_BYTES = int(os.environ.get('SPRITE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+
+class Sprite(NamedTuple):
+    size: Tuple[int, int]
+    data: bytes
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> 'Sprite':
+        return cls(image.size, image.convert('RGBA').tobytes())
+
+    @property
+    def image(self) -> Image.Image:
+        return Image.frombytes('RGBA', self.size, self.data)
+
+
+class SpriteCache(SingletonBase):
+    """Finished head and body renders of a skin, per (uuid, texture, scale)
+
+    Sprites are kept decoded in memory and as PNG in Redis. The texture hash is part of every key, so a new
+    skin never hits an old sprite, and the old sprites of a player are dropped from memory once it is seen.
+    """
+
+    def __init__(self):
+        self._sprites = LRUCache(SPRITE_CACHE_MAX_BYTES, getsizeof=lambda sprite: len(sprite.data))
+        self._textures: Dict[str, str] = {}
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+
+    def _forget(self, uuid: str):
+        for key in [key for key in self._sprites.keys() if key[1] == uuid]:
+            del self._sprites[key]
+
+    async def get(self, kind: str, skin: Skin, scale: int, draw: Callable[[Skin, int], Render]) -> Sprite:
+        if self._textures.get(skin.uuid, skin.texture) != skin.texture:
+            self._forget(skin.uuid)
+        self._textures[skin.uuid] = skin.texture
+
+        key = kind, skin.uuid, skin.texture, scale
+        if sprite := self._sprites.get(key):
+            self._hits += 1
+            return sprite
+
+        conn = RedisClient().conn
+        redis_key = f'sprite:{kind}:{skin.uuid}:{skin.texture}:{scale}'
+
+        if cached := await conn.get(redis_key):
+            self._redis_hits += 1
+            sprite = Sprite.from_image(Image.open(BytesIO(cached)))
+        else:
+            self._misses += 1
+            image = (await RenderExecutor().run(draw, skin, scale)).image
+            sprite = Sprite.from_image(image)
+
+            with BytesIO() as fp:
+                image.save(fp, format='PNG', compress_level=1)
+                await conn.set(redis_key, fp.getvalue(), ex=SPRITE_CACHE_TTL)
+
+        self._sprites[key] = sprite
+        return sprite
+
+    @property
+    def stats(self) -> dict:
+        lookups = self._hits + self._redis_hits + self._misses
+
+        return {
+            'entries': len(self._sprites),
+            'bytes': self._sprites.currsize,
+            'hits': self._hits,
+            'redis_hits': self._redis_hits,
+            'misses': self._misses,
+            'hit_ratio': (self._hits + self._redis_hits) / lookups if lookups else 0.0,
+        }
@@ -2,14 +2,15 @@ import random
 from abc import ABC
 from typing import List, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 from bot.api_compatability_layer import get_player_cosmetics, get_player_info
 from bot.card.PlayerCard import PlayerCard
 from bot.card.PlayerModel import PlayerModel
 from bot.card.Render import Render
-from bot.card.Ribbon import Ribbon
-from bot.card.card import FONT_BLACK, FONT_BOLD, FONT_LIGHT, SPACING
+from bot.card.RibbonStrips import RibbonStrips
+from bot.card.card import SPACING
+from bot.card.fonts import FONT_BLACK, FONT_BOLD, FONT_LIGHT, get_font, text_length
 from bot.cosmetics.cosmetics import CosmeticsType
 from bot.player.stats import PlayerInfo, PlayerStatsType
 from helpers.utilities import get_number_representation, get_timedelta_representation
@@ -29,23 +30,33 @@ class StatsCard(PlayerCard):
     async def get_stats(self, player_info: PlayerInfo) -> List[Tuple[str]]:
         raise NotImplementedError()
 
-    async def render(self) -> Render:
+    async def prepare(self) -> dict:
         player_info = await get_player_info(username=self._username, discord_user=self._discord_user)
         player_cosmetics = await get_player_cosmetics(username=self._username, discord_user=self._discord_user)
-        image_skin = (await PlayerModel(await player_info.uuid, 6).render()).image
-        stats = await self.get_stats(player_info)
+
+        return {
+            'username': await player_info.username,
+            'stats': await self.get_stats(player_info),
+            'model': await PlayerModel(await player_info.uuid, 6).prepare(),
+            'title': player_cosmetics.get(CosmeticsType.Title),
+            'background': self._background,
+        }
+
+    @staticmethod
+    def draw(username: str, stats: List[Tuple[str, str]], model: dict, title, background: str) -> Render:
+        image_skin = PlayerModel.draw(**model).image
 
         image_base = Image.new('RGBA', (STATS_CARD_WIDTH, STATS_CARD_HEIGHT), color=(0, 0, 0, 0))
         draw_base = ImageDraw.Draw(image_base)
 
-        font_username = ImageFont.truetype(FONT_BOLD, 36)
-        font_stats_header = ImageFont.truetype(FONT_LIGHT, 18)
-        font_stats = ImageFont.truetype(FONT_BLACK, 54)
+        font_username = get_font(FONT_BOLD, 36)
+        font_stats_header = get_font(FONT_LIGHT, 18)
+        font_stats = get_font(FONT_BLACK, 54)
 
-        length_name = draw_base.textlength(await player_info.username, font_username)
+        length_name = text_length(FONT_BOLD, 36, username)
 
         width_required = 12 * SPACING + image_skin.width + length_name
-        if CosmeticsType.Title in player_cosmetics:
+        if title:
             width_required += 135
 
         if width_required > image_base.width:
@@ -53,7 +64,7 @@ class StatsCard(PlayerCard):
             draw_base = ImageDraw.Draw(image_base)
 
         image_background = image_base.copy()
-        image_background.paste(Image.open(self._background))
+        image_background.paste(Image.open(background))
 
         image_mask = image_base.copy()
         draw_mask = ImageDraw.Draw(image_mask)
@@ -79,26 +90,22 @@ class StatsCard(PlayerCard):
 
         image_base.paste(image_skin, (5 * SPACING, 2 * SPACING), mask=image_skin)
 
-        draw_base.text((10 * SPACING + image_skin.width, 3 * SPACING), await player_info.username, (235, 235, 235),
-                       font_username)
+        draw_base.text((10 * SPACING + image_skin.width, 3 * SPACING), username, (235, 235, 235), font_username)
 
         draw_base.text((10 * SPACING + image_skin.width, 8 * SPACING), stats[0][0], (192, 192, 192), font_stats_header)
         draw_base.text((10 * SPACING + image_skin.width, 10 * SPACING), stats[0][1], (77, 189, 138), font_stats)
 
-        length_stats_left = draw_base.textlength(stats[0][1], font_stats)
+        length_stats_left = text_length(FONT_BLACK, 54, stats[0][1])
 
         draw_base.text((14 * SPACING + image_skin.width + max(length_stats_left, 80), 8 * SPACING), stats[1][0],
                        (192, 192, 192), font_stats_header)
         draw_base.text((14 * SPACING + image_skin.width + max(length_stats_left, 80), 10 * SPACING), stats[1][1],
                        (77, 189, 138), font_stats)
 
-        if title := player_cosmetics.get(CosmeticsType.Title):
-            ribbon = await (getattr(title, 'ribbon', Ribbon)(title)).render()
-
+        if title:
             frames = []
-            for image in ribbon.images:
+            for image in RibbonStrips().frames(title):
                 frame = image_base.copy()
-                image = image.rotate(-35, expand=True).crop((0, 30, 164, STATS_CARD_HEIGHT))
                 frame.paste(image, (image_base.width - 175, SPACING), mask=image)
                 frames.append(frame)
 
@@ -1,7 +1,9 @@
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
 
+import asyncstdlib as a
 import nextcord
-from PIL import Image, ImageDraw, ImageFont
+import sentry_sdk
+from PIL import Image, ImageDraw
 
 from bot.api.StreetRunnerApi.Leaderboard import LeaderboardTime
 from bot.api.StreetRunnerApi.Player import Player
@@ -9,12 +11,16 @@ from bot.api_compatability_layer import get_leaderboard, get_player_info, get_po
 from bot.card.Avatar import Avatar
 from bot.card.GenericLeaderboard import GenericLeaderboard
 from bot.card.Render import Render
-from bot.card.card import FONT_BLACK, FONT_BOLD, SPACING
+from bot.card.card import SPACING
+from bot.card.fonts import FONT_BLACK, FONT_BOLD, get_font, text_length
 from bot.exceptions import DiscordNotLinkedError
+from bot.player.hydrate import hydrate
 from bot.player.privacy import Privacy
 from bot.player.stats import PlayerInfo
 from helpers.utilities import get_timedelta_representation
 
+LEADERBOARD_TIME_AVATAR_SCALE = 6
+
 
 class TimeLeaderboard(GenericLeaderboard):
     def __init__(self, username: str = None, discord_user: nextcord.User = None):
@@ -41,19 +47,40 @@ class TimeLeaderboard(GenericLeaderboard):
     async def fill_separator(self) -> bool:
         return True
 
-    async def render_row(self, ctx, player_info) -> Render:
+    async def layout(self) -> dict:
+        return {
+            'POSITION_LENGTH': max(round(text_length(
+                FONT_BLACK, 24, f'#{self._target_position if self._target_position else 0}')), 4 * SPACING),
+        }
+
+    async def row_data(self, player_info: PlayerInfo) -> dict:
+        return {
+            'avatar': await Avatar(await player_info.uuid, LEADERBOARD_TIME_AVATAR_SCALE).prepare(),
+            'username': await player_info.username,
+            'time_played': get_timedelta_representation(await player_info.time_played),
+            'highlighted': self._target_position != -1 and (
+                    await player_info.username == await self._target.username),
+        }
+
+    @staticmethod
+    def row_width(ctx, avatar: dict, username: str, time_played: str, **row) -> float:
+        return (16 * SPACING + ctx['POSITION_LENGTH'] + avatar['sprite'].size[0] + text_length(FONT_BOLD, 18, username)
+                + text_length(FONT_BOLD, 18, time_played))
+
+    @staticmethod
+    def draw_row(ctx, avatar: dict, username: str, time_played: str, highlighted: bool) -> Render:
         if ctx['POSITION'] != 1:
             ctx['ROW_HEIGHT'] = 75 + 2 * SPACING
 
         image_row = Image.new('RGBA', (ctx['ROW_WIDTH'], ctx['ROW_HEIGHT']), color=(0, 0, 0, 0))
         draw_row = ImageDraw.Draw(image_row)
 
-        image_avatar = (await Avatar(await player_info.uuid, 6).render()).image
+        font_position = get_font(FONT_BLACK, 24)
+        font_stats = get_font(FONT_BOLD, 18)
 
-        length_name = draw_row.textlength(await player_info.username, self._font_stats)
-        length_time = draw_row.textlength(get_timedelta_representation(await player_info.time_played), self._font_stats)
+        image_avatar = Avatar.draw(**avatar).image
 
-        width_required = 16 * SPACING + self._position_length + image_avatar.width + length_name + length_time
+        width_required = TimeLeaderboard.row_width(ctx, avatar, username, time_played)
         if width_required > image_row.width:
             image_row = Image.new('RGBA', (int(width_required), ctx['ROW_HEIGHT']), color=(0, 0, 0, 0))
             draw_row = ImageDraw.Draw(image_row)
@@ -65,57 +92,71 @@ class TimeLeaderboard(GenericLeaderboard):
             (214, 214, 214, 255),
         ][min(ctx['POSITION'] - 1, 3)]
 
-        draw_row.text((2 * SPACING + self._position_length, image_row.height // 2),
-                      f'#{ctx["POSITION"]}', (214, 214, 214, 255), self._font_position, anchor='rm')
+        draw_row.text((2 * SPACING + ctx['POSITION_LENGTH'], image_row.height // 2),
+                      f'#{ctx["POSITION"]}', (214, 214, 214, 255), font_position, anchor='rm')
 
-        draw_row.line((5 * SPACING + self._position_length, 0,
-                       5 * SPACING + self._position_length, image_row.height),
+        draw_row.line((5 * SPACING + ctx['POSITION_LENGTH'], 0,
+                       5 * SPACING + ctx['POSITION_LENGTH'], image_row.height),
                       (214, 214, 214, 255))
 
-        draw_row.ellipse((int(4.5 * SPACING) + self._position_length,
+        draw_row.ellipse((int(4.5 * SPACING) + ctx['POSITION_LENGTH'],
                           (image_row.height - SPACING) // 2,
-                          int(5.5 * SPACING) + self._position_length,
+                          int(5.5 * SPACING) + ctx['POSITION_LENGTH'],
                           (image_row.height + SPACING) // 2),
                          highlight_color)
 
-        draw_row.arc((4 * SPACING + self._position_length,
+        draw_row.arc((4 * SPACING + ctx['POSITION_LENGTH'],
                       image_row.height // 2 - SPACING,
-                      6 * SPACING + self._position_length,
+                      6 * SPACING + ctx['POSITION_LENGTH'],
                       image_row.height // 2 + SPACING),
                      -30, 30, highlight_color)
 
-        draw_row.arc((4 * SPACING + self._position_length,
+        draw_row.arc((4 * SPACING + ctx['POSITION_LENGTH'],
                       image_row.height // 2 - SPACING,
-                      6 * SPACING + self._position_length,
+                      6 * SPACING + ctx['POSITION_LENGTH'],
                       image_row.height // 2 + SPACING),
                      150, 210, highlight_color)
 
         image_row.paste(image_avatar,
-                        (8 * SPACING + self._position_length, (image_row.height - image_avatar.height) // 2))
+                        (8 * SPACING + ctx['POSITION_LENGTH'], (image_row.height - image_avatar.height) // 2))
 
-        draw_row.text((10 * SPACING + self._position_length + image_avatar.width, image_row.height // 2),
-                      await player_info.username,
-                      (212, 175, 55, 255) if self._target_position != -1 and (
-                              await player_info.username == await self._target.username) else (
-                          255, 255, 255, 255), self._font_stats, anchor='lm')
+        draw_row.text((10 * SPACING + ctx['POSITION_LENGTH'] + image_avatar.width, image_row.height // 2),
+                      username, (212, 175, 55, 255) if highlighted else (255, 255, 255, 255), font_stats,
+                      anchor='lm')
 
         draw_row.text((image_row.width - 2 * SPACING, image_row.height // 2),
-                      get_timedelta_representation(await player_info.time_played), (255, 255, 255, 255),
-                      self._font_stats,
-                      anchor='rm')
+                      time_played, (255, 255, 255, 255), font_stats, anchor='rm')
 
         return Render(image_row)
 
-    async def render_separator(self, ctx) -> Render:
+    @staticmethod
+    def draw_separator(ctx) -> Render:
         image_separator = Image.new('RGBA', (ctx['ROW_WIDTH'], 30), color=(0, 0, 0, 0))
         image_flight = Image.open('images/flight.png').resize((30, 30)).rotate(180)
 
-        image_separator.paste(image_flight, (5 * SPACING + self._position_length - image_flight.width // 2,
+        image_separator.paste(image_flight, (5 * SPACING + ctx['POSITION_LENGTH'] - image_flight.width // 2,
                                              (image_separator.height - image_flight.height) // 2), mask=image_flight)
 
         return Render(image_separator, preferred_height=10)
 
-    async def render(self) -> Render:
+    async def prewarm(self) -> List[str]:
+        """Caches the avatars of the players currently on the leaderboard, returning their uuids"""
+        leaderboard = [x async for x in a.islice(self._data, 5)]
+        await hydrate(leaderboard, 'PlayerInfo')
+
+        uuids = []
+        for player_info in leaderboard:
+            try:
+                uuid = await player_info.uuid
+                await Avatar(uuid, LEADERBOARD_TIME_AVATAR_SCALE).prepare()
+                uuids.append(uuid)
+            except Exception as e:
+                # a player without a skin should not keep the rest of the leaderboard from being cached
+                sentry_sdk.capture_exception(e)
+
+        return uuids
+
+    async def prepare(self) -> dict:
         self._target = None
         self._target_position = -1
         if self._username or self._discord_user:
@@ -134,10 +175,6 @@ class TimeLeaderboard(GenericLeaderboard):
         except StopAsyncIteration:
             pass
 
-        self._font_position = ImageFont.truetype(FONT_BLACK, 24)
-        self._font_stats = ImageFont.truetype(FONT_BOLD, 18)
-
-        self._position_length = max(round(ImageDraw.Draw(Image.new('RGB', (0, 0))).textlength(
-            f'#{self._target_position if self._target_position else 0}', self._font_position)), 4 * SPACING)
+        await hydrate([*self._leaderboard_data, self._target], 'PlayerInfo', 'PlayerStatsTime')
 
-        return await super().render()
+        return await super().prepare()
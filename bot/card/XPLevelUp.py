@@ -1,12 +1,15 @@
-from io import BytesIO
-
 import nextcord
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
 
+from bot.card.DiscordAvatar import DiscordAvatar, DiscordAvatarCache
 from bot.card.Render import Render, Renderable
-from bot.card.card import FONT_BLACK, FONT_BOLD, FONT_LIGHT, SPACING
+from bot.card.card import SPACING
+from bot.card.fonts import FONT_BLACK, FONT_BOLD, FONT_LIGHT, get_font, text_length
+from helpers.gif import quantize_layers
 
 XP_LEVELUP_WIDTH = 580
+XP_LEVELUP_PALETTE_SAMPLE_SIZE = 1 << 15
 
 
 class XPLevelUp(Renderable):
@@ -15,7 +18,17 @@ class XPLevelUp(Renderable):
         self._level_before = level_before
         self._level_after = level_after
 
-    async def render(self) -> Render:
+    async def prepare(self) -> dict:
+        return {
+            'name': self._discord_user.name,
+            'discriminator': self._discord_user.discriminator,
+            'level_before': self._level_before,
+            'level_after': self._level_after,
+            'avatar': await DiscordAvatarCache().get(self._discord_user, 128, animated=True),
+        }
+
+    @staticmethod
+    def draw(name: str, discriminator: str, level_before: int, level_after: int, avatar: DiscordAvatar) -> Render:
         def get_arrow_position(t):
             if t < 10:
                 return get_from_linear_eqn(0, 10, 0, 0.45, t)
@@ -33,15 +46,6 @@ class XPLevelUp(Renderable):
         def get_from_linear_eqn(x1, x2, y1, y2, x):
             return (y1 - y2) / (x1 - x2) * (x - x1) + y1
 
-        def get_animated_avatar_frames(avatar):
-            reset = False
-            while True:
-                try:
-                    avatar.seek(0 if reset else avatar.tell() + 1)
-                except EOFError:
-                    avatar.seek(0)
-                reset = yield avatar
-
         image_base = Image.new('RGBA', (XP_LEVELUP_WIDTH, 100), color=(0, 0, 0, 0))
         draw_base = ImageDraw.Draw(image_base)
 
@@ -51,14 +55,14 @@ class XPLevelUp(Renderable):
         draw_arrow.polygon([(0, 20), (15, 0), (30, 20)], fill=(77, 189, 138, 255))
         draw_arrow.rectangle((10, 20, 20, 30), fill=(77, 189, 138, 255))
 
-        font_name = ImageFont.truetype(FONT_BOLD, 27)
-        font_discrim = ImageFont.truetype(FONT_LIGHT, 22)
-        font_level = ImageFont.truetype(FONT_BLACK, 24)
+        font_name = get_font(FONT_BOLD, 27)
+        font_discrim = get_font(FONT_LIGHT, 22)
+        font_level = get_font(FONT_BLACK, 24)
 
-        length_name = draw_base.textlength(self._discord_user.name, font_name)
-        length_discrim = draw_base.textlength(self._discord_user.discriminator, font_discrim)
-        length_level = draw_base.textlength(str(self._level_after), font_level)
-        length_level_label = draw_base.textlength('LEVEL ', font_level)
+        length_name = text_length(FONT_BOLD, 27, name)
+        length_discrim = text_length(FONT_LIGHT, 22, discriminator)
+        length_level = text_length(FONT_BLACK, 24, str(level_after))
+        length_level_label = text_length(FONT_BLACK, 24, 'LEVEL ')
 
         width_required = 12 * SPACING + 65 + length_name + length_discrim + length_level_label + length_level
         if width_required > image_base.width:
@@ -68,54 +72,74 @@ class XPLevelUp(Renderable):
         draw_base.rounded_rectangle((0, 0, image_base.width, 100), fill=(32, 34, 37, 255), radius=15)
 
         draw_base.text((5 * SPACING + 65, (image_base.height + SPACING) // 2),
-                       self._discord_user.name, (255, 255, 255, 255), font_name, anchor='ls')
+                       name, (255, 255, 255, 255), font_name, anchor='ls')
 
         draw_base.text((6 * SPACING + 65 + length_name, (image_base.height + SPACING) // 2),
-                       '#' + self._discord_user.discriminator, (192, 192, 192, 255), font_discrim, anchor='ls')
+                       '#' + discriminator, (192, 192, 192, 255), font_discrim, anchor='ls')
 
         draw_base.text(
             (image_base.width - 2 * SPACING - max(length_level, image_arrow.width), image_base.height // 2),
             'LEVEL ', (77, 189, 138, 255), font_level, anchor='rm')
 
-        image_mask = Image.new('RGBA', (65, 65), (0, 0, 0, 0))
-        draw_mask = ImageDraw.Draw(image_mask)
-        draw_mask.ellipse((0, 0, 65, 65), fill=(255, 255, 255, 255))
-
-        try:
-            image_avatar = Image.open(
-                BytesIO(await self._discord_user.display_avatar.with_size(128).with_format('gif').read())
-            )
-            avatar_frames = get_animated_avatar_frames(image_avatar)
-            animated_avatar = True
-        except nextcord.InvalidArgument:
-            image_avatar = Image.open(
-                BytesIO(await self._discord_user.display_avatar.with_size(128).with_static_format('png').read())
-            )
-            image_base.paste(image_avatar.resize((65, 65)), (2 * SPACING, (image_base.height - 65) // 2),
-                             mask=image_mask)
-            animated_avatar = False
-
-        frames = []
+        avatar_frames = avatar.frames(65)
+        avatar_box = (2 * SPACING, (image_base.height - 65) // 2, 2 * SPACING + 65, (image_base.height + 65) // 2)
+
+        # every avatar frame is masked onto its patch of the base once. The animation starts from the second
+        # frame of the avatar and ends on the first.
+        if avatar.animated:
+            avatar_patches = []
+            for frame in avatar_frames.frames:
+                patch = image_base.crop(avatar_box)
+                patch.paste(frame, mask=avatar_frames.mask)
+                avatar_patches.append(patch)
+
+            avatar_sequence = [(t + 1) % len(avatar_patches) for t in range(30)] + [0]
+        else:
+            image_base.paste(avatar_frames.frames[0], avatar_box[:2], mask=avatar_frames.mask)
+            avatar_patches = []
+            avatar_sequence = []
+
+        # only the column with the arrow and the levels changes from frame to frame
+        column = max(length_level, image_arrow.width)
+        strip_left = int(image_base.width - 2 * SPACING - max(column, text_length(FONT_BLACK, 24, str(level_before)))
+                         - SPACING)
+        strip_base = image_base.crop((strip_left, 0, image_base.width, image_base.height))
+
+        strips = []
         for t in range(31):
-            frame = image_base.copy()
-            draw_frame = ImageDraw.Draw(frame)
-
-            if animated_avatar:
-                frame.paste((next(avatar_frames) if t < 30 else avatar_frames.send(True)).resize((65, 65)),
-                            (2 * SPACING, (image_base.height - 65) // 2), mask=image_mask)
+            strip = strip_base.copy()
+            draw_strip = ImageDraw.Draw(strip)
 
-            frame.paste(image_arrow, (
-                image_base.width - 2 * SPACING - (max(length_level, image_arrow.width) + image_arrow.width) // 2,
+            strip.paste(image_arrow, (
+                image_base.width - 2 * SPACING - (column + image_arrow.width) // 2 - strip_left,
                 int(get_arrow_position(t) * -(image_arrow.height + image_base.height) + image_base.height)),
                         mask=image_arrow)
-            draw_frame.text(
-                (image_base.width - 2 * SPACING - max(length_level, image_arrow.width) // 2,
-                 int((1 - get_old_level_position(t)) * image_base.height)),
-                str(self._level_before), (77, 189, 138, 255), font_level, anchor='mm')
-            draw_frame.text((image_base.width - 2 * SPACING - max(length_level, image_arrow.width) // 2,
+            draw_strip.text((image_base.width - 2 * SPACING - column // 2 - strip_left,
+                             int((1 - get_old_level_position(t)) * image_base.height)),
+                            str(level_before), (77, 189, 138, 255), font_level, anchor='mm')
+            draw_strip.text((image_base.width - 2 * SPACING - column // 2 - strip_left,
                              int((1 - get_new_level_position(t)) * image_base.height)),
-                            str(self._level_after), (77, 189, 138, 255), font_level, anchor='mm')
+                            str(level_after), (77, 189, 138, 255), font_level, anchor='mm')
 
+            strips.append(strip)
+
+        frames = []
+        for t, strip in enumerate(strips):
+            frame = image_base.copy()
+            if avatar_sequence:
+                frame.paste(avatar_patches[avatar_sequence[t]], avatar_box[:2])
+            frame.paste(strip, (strip_left, 0))
             frames.append(frame)
 
-        return Render(*frames)
+        # the GIF is put together from the same pieces, quantized once each
+        palette, (index_base, *index_pieces) = quantize_layers([image_base, *avatar_patches, *strips],
+                                                                    sample_size=XP_LEVELUP_PALETTE_SAMPLE_SIZE)
+        index_avatars, index_strips = index_pieces[:len(avatar_patches)], index_pieces[len(avatar_patches):]
+
+        indices = np.repeat(index_base[np.newaxis], len(frames), axis=0)
+        if avatar_sequence:
+            indices[:, avatar_box[1]:avatar_box[3], avatar_box[0]:avatar_box[2]] = \
+                np.stack(index_avatars)[avatar_sequence]
+        indices[:, :, strip_left:] = np.stack(index_strips)
+
+        return Render(*frames, quantized=(palette, indices))
@@ -0,0 +1,53 @@
+import functools
+import os
+from typing import Optional, Tuple
+
+from PIL import ImageFont
+
+FONT_BLACK = 'fonts/Roboto-Black.ttf'
+FONT_BOLD = 'fonts/Roboto-Bold.ttf'
+FONT_REGULAR = 'fonts/Roboto-Regular.ttf'
+FONT_LIGHT = 'fonts/Roboto-Light.ttf'
+
+FONT_MC_BOLD = 'fonts/Minecraft-Bold.otf'
+FONT_MC_REGULAR = 'fonts/Minecraft-Regular.otf'
+
+# every size a card draws with, loaded up front by each render worker
+FONT_SIZES = {
+    FONT_BLACK: [24, 27, 36, 48, 54],
+    FONT_BOLD: [18, 24, 27, 36],
+    FONT_REGULAR: [18],
+    FONT_LIGHT: [18, 22, 27],
+    FONT_MC_REGULAR: [18],
+}
+
+TEXT_METRICS_CACHE_SIZE = int(os.environ.get('TEXT_METRICS_CACHE_SIZE', 8192))
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(font: str, size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(font, size)
+
+
+def preload_fonts():
+    for font, sizes in FONT_SIZES.items():
+        for size in sizes:
+            get_font(font, size)
+
+
+# Both match ImageDraw.textlength and ImageDraw.textbbox on RGB and RGBA images, which measure in mode L
+
+@functools.lru_cache(maxsize=TEXT_METRICS_CACHE_SIZE)
+def text_length(font: str, size: int, text: str) -> float:
+    return get_font(font, size).getlength(text, 'L')
+
+
+@functools.lru_cache(maxsize=TEXT_METRICS_CACHE_SIZE)
+def _text_bbox(font: str, size: int, text: str, anchor: Optional[str]) -> Tuple[int, int, int, int]:
+    return get_font(font, size).getbbox(text, 'L', anchor=anchor)
+
+
+def text_bbox(font: str, size: int, text: str, xy: Tuple[int, int] = (0, 0),
+              anchor: Optional[str] = None) -> Tuple[int, int, int, int]:
+    left, top, right, bottom = _text_bbox(font, size, text, anchor)
+    return left + xy[0], top + xy[1], right + xy[0], bottom + xy[1]
@@ -1,17 +1,66 @@
+import os
+
 import nextcord
-from nextcord.ext import commands
+import sentry_sdk
+from nextcord.ext import commands, tasks
 
 from bot.card.Podium import BlocksPodium, DeathsPodium, InfamyPodium, KdaPodium, KillsPodium, MoneyPodium, RankPodium
+from bot.card.PlayerModel import PlayerModel
 from bot.card.TimeLeaderboard import TimeLeaderboard
 from bot.card.XPLeaderboard import XPLeaderboard
 from bot.exceptions import NotEnoughDataError, UsernameError
 
+LEADERBOARD_PRERENDER_INTERVAL = int(os.environ.get('LEADERBOARD_PRERENDER_INTERVAL', 60))
+SPRITE_PREWARM_INTERVAL = int(os.environ.get('SPRITE_PREWARM_INTERVAL', 600))
+SPRITE_PREWARM_MODEL_SCALES = (3, 6)
+
 
 class Leaderboard(commands.Cog):
     """rank, blocks, infamy, kda, kills, deaths, time, money, xp"""
 
     def __init__(self, bot):
         self.bot = bot
+        self.prerender_leaderboards.start()
+        self.prewarm_sprites.start()
+
+    @tasks.loop(seconds=LEADERBOARD_PRERENDER_INTERVAL)
+    async def prerender_leaderboards(self):
+        for podium in (RankPodium, BlocksPodium, InfamyPodium, KdaPodium, KillsPodium, DeathsPodium, MoneyPodium):
+            try:
+                await podium.refresh_snapshot()
+            except NotEnoughDataError:
+                pass
+            except Exception as e:
+                # one podium failing should not stop the others, nor the next refresh
+                sentry_sdk.capture_exception(e)
+
+    @prerender_leaderboards.before_loop
+    async def prerender_leaderboards_before_loop(self):
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(seconds=SPRITE_PREWARM_INTERVAL)
+    async def prewarm_sprites(self):
+        uuids = {}
+        for leaderboard in (RankPodium(), BlocksPodium(), InfamyPodium(), KdaPodium(), KillsPodium(), DeathsPodium(),
+                            MoneyPodium(), TimeLeaderboard()):
+            try:
+                uuids.update(dict.fromkeys(await leaderboard.prewarm()))
+            except NotEnoughDataError:
+                pass
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+
+        # the players on top are the ones most likely to have their stats looked up as well
+        for uuid in uuids:
+            for scale in SPRITE_PREWARM_MODEL_SCALES:
+                try:
+                    await PlayerModel(uuid, scale).prepare()
+                except Exception as e:
+                    sentry_sdk.capture_exception(e)
+
+    @prewarm_sprites.before_loop
+    async def prewarm_sprites_before_loop(self):
+        await self.bot.wait_until_ready()
 
     @commands.group()
     async def leaderboard(self, ctx):
@@ -26,63 +75,63 @@ class Leaderboard(commands.Cog):
         """Displays the current leaderboard in terms of prison ranks"""
         async with ctx.typing():
             render = await RankPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='blocks')
     async def leaderboard_blocks(self, ctx):
         """Displays the current leaderboard in terms of blocks mined"""
         async with ctx.typing():
             render = await BlocksPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='infamy')
     async def leaderboard_infamy(self, ctx):
         """Displays the current leaderboard in terms of arena Infamy"""
         async with ctx.typing():
             render = await InfamyPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='kda')
     async def leaderboard_kda(self, ctx):
         """Displays the current leaderboard in terms of arena KDA"""
         async with ctx.typing():
             render = await KdaPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='kills')
     async def leaderboard_kills(self, ctx):
         """Displays the current leaderboard in terms of arena kills"""
         async with ctx.typing():
             render = await KillsPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='deaths')
     async def leaderboard_deaths(self, ctx):
         """Displays the current leaderboard in terms of arena deaths"""
         async with ctx.typing():
             render = await DeathsPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='time')
     async def leaderboard_time(self, ctx):
         """Displays the current leaderboard in terms of play time"""
         async with ctx.typing():
             render = await TimeLeaderboard(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='money')
     async def leaderboard_money(self, ctx):
         """Displays the current leaderboard in terms of money"""
         async with ctx.typing():
             render = await MoneyPodium(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file('PNG'), 'leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file('PNG'), 'leaderboard.png'))
 
     @leaderboard.command(name='xp')
     async def leaderboard_xp(self, ctx):
         """Displays the current leaderboard in terms of discord XP"""
         async with ctx.typing():
             render = await XPLeaderboard(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file(format='PNG'), 'xp_leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file(format='PNG'), 'xp_leaderboard.png'))
 
     @leaderboard.error
     @leaderboard_rank.error
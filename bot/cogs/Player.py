@@ -77,10 +77,8 @@ class Player(commands.Cog, PlayerRespondMixin):
             render = await card_type(username=username, discord_user=user, privacy=privacy).render()
 
         try:
-            if render.animated:
-                file = nextcord.File(render.file_animated(format='GIF', loop=0), 'player_card.gif')
-            else:
-                file = nextcord.File(render.file('PNG'), 'player_card.png')
+            fp, animated = await render.file_auto({'format': 'PNG'}, {'format': 'GIF', 'loop': 0})
+            file = nextcord.File(fp, 'player_card.gif' if animated else 'player_card.png')
 
             if (await self.respond(ctx, player, privacy, file=file) == PlayerRespondType.DM
                     and ctx.channel.type == nextcord.ChannelType.text):
@@ -8,9 +8,19 @@ from aiohttp_apispec import docs, querystring_schema, request_schema, response_s
 from aiohttp_remotes import BasicAuth, Secure, XForwardedRelaxed, setup
 from nextcord.ext import commands, tasks
 
+from bot.api.ApiCache import ApiCache
+from bot.api.HttpClient import HttpClient
+from bot.api.RequestContext import RequestContext
 from bot.api.StreetRunnerApi.Player import Player
+from bot.card.DiscordAvatar import DiscordAvatarCache
+from bot.card.RenderCache import RenderCache
+from bot.card.RenderExecutor import RenderExecutor
+from bot.card.SpriteCache import SpriteCache
 from bot.cosmetics import pets, titles
 from docs.schema import ChannelSchema, MessageQuerySchema, MessageSchema, MessageUpdateResponseSchema, MessageUpdateSchema, UserSchema
+from helpers.cache import cached_function_stats
+from store.CacheCodec import CacheCodec
+from store.PostgresClient import PostgresClient
 
 
 class WebServer(commands.Cog):
@@ -36,6 +46,26 @@ class WebServer(commands.Cog):
         async def health(request):
             return web.Response()
 
+        @docs(
+            tags=['metrics'],
+            summary='Get metrics',
+            description='Retrieves internal performance metrics of the bot',
+        )
+        @self.routes.get('/metrics', allow_head=False)
+        async def metrics(request):
+            return web.json_response({
+                'http': HttpClient().stats,
+                'api_cache': ApiCache().stats,
+                'api_requests': RequestContext.stats(),
+                'cached_functions': cached_function_stats(),
+                'render': RenderExecutor().stats,
+                'render_cache': RenderCache().stats,
+                'sprite_cache': SpriteCache().stats,
+                'discord_avatar_cache': DiscordAvatarCache().stats,
+                'cache_codec': CacheCodec().stats,
+                'postgres': PostgresClient().stats,
+            })
+
         @docs(
             tags=['channel'],
             summary='Get channels',
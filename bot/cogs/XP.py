@@ -1,16 +1,12 @@
 import asyncio
-import datetime
 
 import nextcord
-from nextcord.ext import commands
-from sqlalchemy import select
+import sentry_sdk
+from nextcord.ext import commands, tasks
 
-from bot.api_compatability_layer import get_chat_xp
 from bot.card.XPCard import XPCard
 from bot.card.XPLeaderboard import XPLeaderboard
-from helpers.xp import get_level_from_xp
-from store.PostgresClient import PostgresClient
-from store.User import User
+from helpers.xp import XP_FLUSH_INTERVAL, XP_RECONCILE_INTERVAL, XPAccumulator, XPRanking, refresh_chat_xp
 
 
 class XP(commands.Cog):
@@ -20,6 +16,8 @@ class XP(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self.flush_xp.start()
+        self.reconcile_xp.start()
 
     @staticmethod
     async def process_message(message):
@@ -27,31 +25,32 @@ class XP(commands.Cog):
             return -1, -1
 
         XP.xp_cooldown[message.author.id] = True
-
-        async with PostgresClient().session() as session:
-            user = (await session.execute(select(User).where(User.discord_id == message.author.id))).scalar()
-
-            if not user:
-                user = User(discord_id=message.author.id,
-                            xp=0,
-                            xp_refreshed=datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc))
-                session.add(user)
-
-            user_level_before = get_level_from_xp(user.xp)
-            refresh_time = datetime.datetime.now(datetime.timezone.utc)
-
-            xp_delta = (await get_chat_xp([user.discord_id], [(user.xp_refreshed, refresh_time)]))[0]
-            if xp_delta is not None:
-                user.xp += xp_delta
-                user.xp_refreshed = refresh_time
-
-            user.xp += 1
-            user_level_after = get_level_from_xp(user.xp)
-            await session.commit()
+        user_level_before, user_level_after = await XPAccumulator().add(message.author.id)
 
         asyncio.get_running_loop().call_later(8, XP.xp_cooldown.pop, message.author.id, None)
         return user_level_before, user_level_after
 
+    @tasks.loop(seconds=XP_FLUSH_INTERVAL)
+    async def flush_xp(self):
+        try:
+            await XPAccumulator().flush()
+        except Exception as e:
+            # pending XP is kept for the next flush, so the loop has to keep running
+            sentry_sdk.capture_exception(e)
+
+    @tasks.loop(seconds=XP_RECONCILE_INTERVAL)
+    async def reconcile_xp(self):
+        try:
+            await refresh_chat_xp()
+        except Exception as e:
+            # the ranking is still rebuilt from what is in Postgres
+            sentry_sdk.capture_exception(e)
+
+        try:
+            await XPRanking().reconcile()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+
     @commands.group()
     async def xp(self, ctx):
         """Displays your current XP and level"""
@@ -59,17 +58,15 @@ class XP(commands.Cog):
             async with ctx.typing():
                 render = await XPCard(discord_user=ctx.author).render()
 
-            if render.animated:
-                await ctx.send(file=nextcord.File(render.file_animated(format='GIF', loop=0), 'xp.gif'))
-            else:
-                await ctx.send(file=nextcord.File(render.file(format='PNG'), 'xp.png'))
+            fp, animated = await render.file_auto({'format': 'PNG'}, {'format': 'GIF', 'loop': 0})
+            await ctx.send(file=nextcord.File(fp, 'xp.gif' if animated else 'xp.png'))
 
     @xp.command(name='leaderboard')
     async def xp_leaderboard(self, ctx):
         """Displays the current leaderboard in terms of discord XP"""
         async with ctx.typing():
             render = await XPLeaderboard(discord_user=ctx.author).render()
-        await ctx.send(file=nextcord.File(render.file(format='PNG'), 'xp_leaderboard.png'))
+        await ctx.send(file=nextcord.File(await render.file(format='PNG'), 'xp_leaderboard.png'))
 
     @xp.error
     @xp_leaderboard.error
@@ -79,17 +76,7 @@ class XP(commands.Cog):
     @xp.group(name='give')
     @commands.has_permissions(administrator=True)
     async def xp_give(self, ctx, target_user: nextcord.User, xp: int):
-        async with PostgresClient().session() as session:
-            user = (await session.execute(select(User).where(User.discord_id == target_user.id))).scalar()
-
-            if not user:
-                user = User(discord_id=target_user.id,
-                            xp=0,
-                            xp_refreshed=datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc))
-                session.add(user)
-
-            user.xp += xp
-            await session.commit()
+        await XPAccumulator().add(target_user.id, xp)
 
     @xp_give.error
     async def on_xp_command_error(self, ctx, error):
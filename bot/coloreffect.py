@@ -2,10 +2,16 @@ import functools
 import itertools
 import math
 
+import numpy as np
 from colour import Color
 
 
 class ColorEffect:
+    """A color that may change over the frames of an animation
+
+    Every frame is compiled into table, an (duration, 4) array of RGBA bytes, when the effect is created.
+    """
+
     animated = False
 
     def __init__(self, *color, duration=1, **kwargs):
@@ -17,15 +23,36 @@ class ColorEffect:
         else:
             self.color = (Color(*color, **kwargs),)
 
+        self.table = self.compile()
+        self._frames = [tuple(frame) for frame in self.table.tolist()]
+
     def __getitem__(self, t):
-        return self.color[0]
+        return self.colors[int(self.frame_indices(np.asarray([t]))[0])]
 
     def __iter__(self):
         for i in range(self.duration):
             yield self[i]
 
+    @property
+    def colors(self):
+        return self.color
+
+    def frame_indices(self, t: np.ndarray) -> np.ndarray:
+        """Index into colors of the color shown at each of the frames t"""
+        return np.zeros(len(t), dtype=np.intp)
+
+    def compile(self) -> np.ndarray:
+        palette = np.empty((len(self.colors), 4), dtype=np.uint8)
+        palette[:, :3] = np.trunc(np.array([color.rgb for color in self.colors]) * 255)
+        palette[:, 3] = int(self.alpha * 255)
+
+        return palette[self.frame_indices(np.arange(self.duration))]
+
     def rgba(self, color):
         if isinstance(color, int):
+            if 0 <= color < self.duration:
+                return self._frames[color]
+
             color = self[color]
 
         return tuple(int(i * 255) for i in (*color.rgb, self.alpha))
@@ -34,8 +61,8 @@ class ColorEffect:
 class ColorEffectBlink(ColorEffect):
     animated = True
 
-    def __getitem__(self, t):
-        return self.color[round(self.time_function(t) // (1 / len(self.color)))]
+    def frame_indices(self, t: np.ndarray) -> np.ndarray:
+        return np.round(np.floor_divide(self.time_function(t), 1 / len(self.color))).astype(np.intp)
 
     def time_function(self, t):
         return t / self.duration
@@ -44,8 +71,13 @@ class ColorEffectBlink(ColorEffect):
 class ColorEffectUnicorn(ColorEffect):
     animated = True
 
-    def __getitem__(self, t):
-        return self.spectrum[round(min(self.time_function(t) * 100 * (len(self.color) - 1), len(self.spectrum) - 1))]
+    @property
+    def colors(self):
+        return self.spectrum
+
+    def frame_indices(self, t: np.ndarray) -> np.ndarray:
+        return np.round(np.minimum(self.time_function(t) * 100 * (len(self.color) - 1),
+                                   len(self.spectrum) - 1)).astype(np.intp)
 
     @functools.cached_property
     def spectrum(self):
@@ -58,11 +90,11 @@ class ColorEffectUnicorn(ColorEffect):
 
 class ColorEffectBreathe(ColorEffectUnicorn):
     def __init__(self, *color, inhale_rate=1.4, exhale_rate=1.4, **kwargs):
-        super().__init__(*color, **kwargs)
         self.inhale_rate = inhale_rate
         self.exhale_rate = exhale_rate
+        super().__init__(*color, **kwargs)
 
     def time_function(self, t):
-        return min(math.e ** (self.inhale_rate * t / self.duration) - 1,
-                   math.e ** (-self.exhale_rate * (t / self.duration - 1)) - 1,
-                   1)
+        return np.minimum(np.minimum(np.power(math.e, self.inhale_rate * t / self.duration) - 1,
+                                     np.power(math.e, -self.exhale_rate * (t / self.duration - 1)) - 1),
+                          1)
@@ -5,17 +5,42 @@ import nextcord
 from nextcord.ext import commands
 from pretty_help import PrettyHelp
 
+from bot.api.RequestContext import RequestContext
+
 env = {}
 
 if os.path.isfile('env.json'):
     with open('env.json') as f:
         env = json.loads(f.read())
 
+
+class Bot(commands.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._shutdown_hooks = []
+
+    async def invoke(self, ctx):
+        # API data is fetched at most once while a command runs, however many parts of it ask for the same thing
+        with RequestContext(ctx.command.qualified_name if ctx.command else ctx.invoked_with or ''):
+            await super().invoke(ctx)
+
+    def add_shutdown_hook(self, hook):
+        self._shutdown_hooks.append(hook)
+        return hook
+
+    async def close(self):
+        await super().close()
+
+        # hooks run once, in reverse order of registration
+        while self._shutdown_hooks:
+            await self._shutdown_hooks.pop()()
+
+
 intents = nextcord.Intents.default()
 intents.members = True
 intents.guilds = True
 
-bot = commands.Bot(command_prefix='!',
-                   intents=intents,
-                   help_command=PrettyHelp(no_category='Other'),
-                   activity=nextcord.Game('mc.streetrunner.gg | !help'))
+bot = Bot(command_prefix='!',
+          intents=intents,
+          help_command=PrettyHelp(no_category='Other'),
+          activity=nextcord.Game('mc.streetrunner.gg | !help'))
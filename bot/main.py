@@ -1,9 +1,13 @@
+import asyncio
 import os
 import sys
 
 import nextcord
 import sentry_sdk
 
+from bot.api.HttpClient import HttpClient
+from bot.card.RenderExecutor import RenderExecutor
+from bot.card.RibbonStrips import RibbonStrips
 from bot.card.XPLevelUp import XPLevelUp
 from bot.cogs.Admin import Admin
 from bot.cogs.Leaderboard import Leaderboard
@@ -11,6 +15,9 @@ from bot.cogs.Player import Player
 from bot.cogs.WebServer import WebServer
 from bot.cogs.XP import XP
 from bot.config import bot
+from helpers.xp import XPAccumulator
+from store.PostgresClient import PostgresClient
+from store.User import check_discord_id_key
 
 BLACKLISTED_CHANNELS = [797035821630095393]
 DEV_MODE = os.environ.get('DEV', None) == 'DEV'
@@ -21,7 +28,7 @@ async def process_xp(message):
         level_before, level_after = await XP.process_message(message)
         if level_after > level_before:
             render = await XPLevelUp(message.author, level_before, level_after).render()
-            await message.channel.send(file=nextcord.File(render.file_animated(format='GIF'), 'xp_levelup.gif'))
+            await message.channel.send(file=nextcord.File(await render.file_animated(format='GIF'), 'xp_levelup.gif'))
 
 
 def is_xp_command(message):
@@ -76,7 +83,16 @@ def main():
     bot.add_cog(Admin(bot))
     bot.add_cog(WebServer(bot))
 
+    bot.add_shutdown_hook(HttpClient().close)
+    bot.add_shutdown_hook(RenderExecutor().close)
+    bot.add_shutdown_hook(PostgresClient().close)
+    bot.add_shutdown_hook(XPAccumulator().flush)
+
     if not test:
+        # XP flushes upsert on discord_id, and cannot write anything without its unique index
+        asyncio.run(check_discord_id_key())
+
+        RibbonStrips().build()
         bot.run(os.environ['TOKEN'])
 
 
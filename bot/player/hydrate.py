@@ -0,0 +1,64 @@
+import asyncio
+from typing import Iterable, List, Optional
+
+from bot.player.stats import PlayerInfo
+
+HYDRATE_CONCURRENCY = 8
+
+
+class HydrationAdapter:
+    async def load(self, schema: str, players: List) -> List:
+        """Returns the preloaded schema (or the exception raised) for each player, in order"""
+        raise NotImplementedError()
+
+
+class ConcurrentHydrationAdapter(HydrationAdapter):
+    def __init__(self, concurrency: int = HYDRATE_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(self, schema: str, player):
+        async with self._semaphore:
+            return await getattr(player, schema)().preload()
+
+    async def load(self, schema: str, players: List) -> List:
+        return await asyncio.gather(*(self.fetch(schema, player) for player in players), return_exceptions=True)
+
+
+async def hydrate(player_infos: Iterable[Optional[PlayerInfo]], *schemas: str,
+                  adapter: HydrationAdapter = None) -> None:
+    """Fetches the given schemas for every player in one concurrent wave
+
+    Players sharing the same parameters share a single fetch. Errors are not raised here, but surface when the
+    corresponding PlayerInfo attribute is awaited.
+    """
+    adapter = adapter if adapter else ConcurrentHydrationAdapter()
+    loop = asyncio.get_running_loop()
+    pending = {}
+
+    for player_info in player_infos:
+        if player_info is None:
+            continue
+
+        for schema in schemas:
+            if player_info.has_schema(schema):
+                continue
+
+            waiting = pending.setdefault(schema, {})
+            if player_info.key not in waiting:
+                waiting[player_info.key] = (player_info.player, loop.create_future())
+
+            player_info.attach_schema(schema, waiting[player_info.key][1])
+
+    async def load(schema, waiting):
+        try:
+            results = await adapter.load(schema, [player for player, _ in waiting.values()])
+        except Exception as e:
+            results = [e] * len(waiting)
+
+        for (_, future), result in zip(waiting.values(), results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    await asyncio.gather(*(load(schema, waiting) for schema, waiting in pending.items()))
@@ -1,3 +1,4 @@
+import asyncio
 from enum import Enum
 
 from bot.player.balance import BalanceType
@@ -10,58 +11,60 @@ class PlayerStatsType(Enum):
 class PlayerInfo:
     def __init__(self, player):
         self._player = player
-        self._player_info = None
-        self._stats_prison = None
-        self._stats_arena = None
-        self._stats_time = None
-        self._stats_wiki = None
-        self._balance = None
+        self._schemas = {}
 
     @property
-    async def uuid(self):
-        if not self._player_info:
-            self._player_info = await self._player.PlayerInfo().preload()
+    def player(self):
+        return self._player
+
+    @property
+    def key(self) -> tuple:
+        return tuple(sorted((k, v) for k, v in self._player._params.items() if v is not None))
+
+    def has_schema(self, schema: str) -> bool:
+        return schema in self._schemas
+
+    def attach_schema(self, schema: str, future: asyncio.Future):
+        self._schemas[schema] = future
 
-        return (await self._player_info.data).uuid
+        def forget_failed(done: asyncio.Future):
+            # retrieving the exception keeps a failure nobody awaited quiet, and a later access fetches again
+            if (done.cancelled() or done.exception()) and self._schemas.get(schema) is done:
+                del self._schemas[schema]
+
+        future.add_done_callback(forget_failed)
+
+    def _schema(self, schema: str) -> asyncio.Future:
+        # concurrent accesses share one in-flight fetch
+        if schema not in self._schemas:
+            self.attach_schema(schema, asyncio.ensure_future(getattr(self._player, schema)().preload()))
+
+        return self._schemas[schema]
 
     @property
-    async def username(self):
-        if not self._player_info:
-            self._player_info = await self._player.PlayerInfo().preload()
+    async def uuid(self):
+        return (await (await self._schema('PlayerInfo')).data).uuid
 
-        return (await self._player_info.data).name
+    @property
+    async def username(self):
+        return (await (await self._schema('PlayerInfo')).data).name
 
     @property
     async def stats_prison(self):
-        if not self._stats_prison:
-            self._stats_prison = await self._player.PlayerStatsPrison().preload()
-
-        return await self._stats_prison.data
+        return await (await self._schema('PlayerStatsPrison')).data
 
     @property
     async def stats_arena(self):
-        if not self._stats_arena:
-            self._stats_arena = await self._player.PlayerStatsArena().preload()
-
-        return await self._stats_arena.data
+        return await (await self._schema('PlayerStatsArena')).data
 
     @property
     async def time_played(self):
-        if not self._stats_time:
-            self._stats_time = await self._player.PlayerStatsTime().preload()
-
-        return (await self._stats_time.data).value
+        return (await (await self._schema('PlayerStatsTime')).data).value
 
     @property
     async def wiki_points(self):
-        if not self._stats_wiki:
-            self._stats_wiki = await self._player.WikiPoints().preload()
-
-        return (await self._stats_wiki.data).value
+        return (await (await self._schema('WikiPoints')).data).value
 
     @property
     async def balance(self):
-        if not self._balance:
-            self._balance = await self._player.PlayerBalance().preload()
-
-        return {BalanceType(x.type): x.balance for x in await self._balance.data}
+        return {BalanceType(x.type): x.balance for x in await (await self._schema('PlayerBalance')).data}
@@ -0,0 +1,100 @@
+import asyncio
+import functools
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+_functions: Dict[str, 'CachedFunctionStats'] = {}
+
+
+class CachedFunctionStats:
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+        self.hits = 0
+        self.error_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.error_hits + self.misses + self.coalesced
+
+        return {
+            'entries': len(self.cache),
+            'size': self.cache.currsize,
+            'hits': self.hits,
+            'error_hits': self.error_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'hit_ratio': (lookups - self.misses) / lookups if lookups else 0.0,
+        }
+
+
+def single_flight_cached(maxsize: int, ttl: float, error_ttl: float = 10, max_size: Optional[int] = None,
+                         getsizeof: Optional[Callable[[Any], int]] = None):
+    """Caches the results of a coroutine function by its arguments
+
+    Concurrent calls with the same arguments share one call in flight. An exception is remembered for
+    error_ttl seconds and raised again to callers in that time, instead of trying again right away. Entries
+    are bounded by count (maxsize), and by their total getsizeof (max_size) if one is given.
+    """
+
+    def decorator(fn):
+        results = TTLCache(max_size if max_size is not None else maxsize, ttl, getsizeof=getsizeof)
+        errors = TTLCache(maxsize, error_ttl)
+        inflight: Dict[Any, asyncio.Future] = {}
+        stats = _functions[f'{fn.__module__}.{fn.__qualname__}'] = CachedFunctionStats(results)
+
+        async def call(key, args, kwargs):
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                stats.errors += 1
+                errors[key] = e
+                raise
+
+            try:
+                results[key] = result
+            except ValueError:
+                # larger than the whole cache
+                return result
+
+            while len(results) > maxsize:
+                results.popitem()
+
+            return result
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = hashkey(*args, **kwargs)
+
+            try:
+                result = results[key]
+                stats.hits += 1
+                return result
+            except KeyError:
+                pass
+
+            if (error := errors.get(key)) is not None:
+                stats.error_hits += 1
+                raise error
+
+            if future := inflight.get(key):
+                stats.coalesced += 1
+                return await asyncio.shield(future)
+
+            stats.misses += 1
+            future = inflight[key] = asyncio.ensure_future(call(key, args, kwargs))
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+            return await asyncio.shield(future)
+
+        wrapper.stats = stats
+        return wrapper
+
+    return decorator
+
+
+def cached_function_stats() -> dict:
+    return {name: stats.as_dict() for name, stats in sorted(_functions.items())}
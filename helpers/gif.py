@@ -0,0 +1,260 @@
+import os
+import struct
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+TRANSPARENT_INDEX = 255
+PALETTE_COLORS = 255
+PALETTE_SAMPLE_SIZE = 1 << 18
+LAYER_ROW_WIDTH = 1024
+
+DISPOSAL_NONE = 1
+DISPOSAL_BACKGROUND = 2
+
+
+class DeltaFrame(NamedTuple):
+    indices: np.ndarray
+    offset: Tuple[int, int]
+    duration: int
+    disposal: int
+
+
+def _stack_frames(images: Sequence[Image.Image]) -> np.ndarray:
+    size = images[0].size
+    if any(image.size != size for image in images):
+        raise ValueError('All frames of an animation must have the same size')
+
+    return np.stack([np.asarray(image.convert('RGBA')) for image in images])
+
+
+def _palette_image(palette: np.ndarray) -> Image.Image:
+    image = Image.new('P', (1, 1))
+    image.putpalette(palette.astype(np.uint8).tobytes())
+    return image
+
+
+def build_palette(rgb: np.ndarray, colors: int = PALETTE_COLORS) -> np.ndarray:
+    """Median cut palette of at most colors entries for an (n, 3) array of pixels"""
+    if not len(rgb):
+        return np.zeros((1, 3), dtype=np.uint8)
+
+    quantized = Image.fromarray(np.ascontiguousarray(rgb).reshape(-1, 1, 3)).quantize(colors, Image.MEDIANCUT)
+    used = int(np.asarray(quantized).max()) + 1
+
+    return np.asarray(quantized.getpalette()[:used * 3], dtype=np.uint8).reshape(-1, 3)
+
+
+def _quantize(pixels: np.ndarray, alpha_threshold: int = 0, matte: Optional[Tuple[int, int, int]] = None,
+              sample_size: int = PALETTE_SAMPLE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantizes a (height, width, 4) array of RGBA pixels against a palette built from them"""
+    alpha = pixels[..., 3]
+    transparent = alpha <= alpha_threshold
+
+    strip = Image.fromarray(pixels, 'RGBA').convert('RGB')
+    if matte is not None:
+        background = Image.new('RGB', strip.size, tuple(matte))
+        background.paste(strip, mask=Image.fromarray(alpha, 'L'))
+        strip = background
+
+    rgb = np.asarray(strip).reshape(-1, 3)
+    step = max(1, rgb.shape[0] // sample_size)
+    colors = build_palette(rgb[::step][~transparent.reshape(-1)[::step]])
+
+    # The last slot is reserved for transparency; pad it with a duplicate so that
+    # nearest color lookups landing on it can be folded back onto the original entry
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    palette[:len(colors)] = colors
+    palette[len(colors):] = colors[0]
+
+    translate = np.arange(256, dtype=np.uint8)
+    translate[len(colors):] = 0
+
+    indices = translate[np.asarray(strip.quantize(palette=_palette_image(palette), dither=Image.NONE))]
+    np.putmask(indices, transparent, TRANSPARENT_INDEX)
+    palette[TRANSPARENT_INDEX] = 0
+
+    return palette, indices
+
+
+def quantize_frames(images: Sequence[Image.Image], alpha_threshold: int = 0,
+                    matte: Optional[Tuple[int, int, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantizes all frames against one shared palette
+
+    Pixels with alpha at or below alpha_threshold become TRANSPARENT_INDEX. Partially transparent pixels
+    above the threshold keep their color, or are blended onto matte if one is given.
+
+    Returns the (256, 3) palette and an (n, height, width) array of palette indices.
+    """
+    frames = _stack_frames(images)
+    n, height, width, _ = frames.shape
+
+    palette, indices = _quantize(frames.reshape(n * height, width, 4), alpha_threshold, matte)
+    return palette, indices.reshape(n, height, width)
+
+
+def quantize_layers(images: Sequence[Image.Image], alpha_threshold: int = 0,
+                    matte: Optional[Tuple[int, int, int]] = None,
+                    sample_size: int = PALETTE_SAMPLE_SIZE) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Quantizes images of any size against one shared palette, like quantize_frames
+
+    Meant for animations assembled from a few pieces, which are quantized once each and then put together
+    as palette indices instead of quantizing every finished frame. The palette is built from about
+    sample_size of their pixels.
+
+    Returns the (256, 3) palette and a (height, width) array of palette indices for each image.
+    """
+    layers = [np.asarray(image.convert('RGBA')).reshape(-1, 4) for image in images]
+    sizes = [len(layer) for layer in layers]
+
+    # laid out in rows of LAYER_ROW_WIDTH pixels, padded with transparent ones
+    pixels = np.zeros((-(-sum(sizes) // LAYER_ROW_WIDTH) * LAYER_ROW_WIDTH, 4), dtype=np.uint8)
+    np.concatenate(layers, out=pixels[:sum(sizes)])
+
+    palette, indices = _quantize(pixels.reshape(-1, LAYER_ROW_WIDTH, 4), alpha_threshold, matte, sample_size)
+    indices = np.split(indices.reshape(-1)[:sum(sizes)], np.cumsum(sizes)[:-1])
+
+    return palette, [layer.reshape(image.height, image.width) for layer, image in zip(indices, images)]
+
+
+def _bbox(mask: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not len(rows):
+        return None
+
+    columns = np.flatnonzero(mask.any(axis=0))
+    return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+
+def _union(a: Tuple[int, int, int, int], b: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+    if b is None:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def delta_frames(indices: np.ndarray, durations: Union[int, List[int]]) -> List[DeltaFrame]:
+    """Reduces quantized frames to the sub-rectangles that change between them
+
+    Identical consecutive frames are merged into one with their durations added up. Each remaining frame
+    only covers the pixels that differ from what is on the canvas, with unchanged pixels inside the
+    rectangle left transparent so the canvas shows through. A frame is disposed to the background only when
+    the frame after it (wrapping around to the first) needs pixels to turn transparent again, and its
+    rectangle is widened to cover them.
+    """
+    if isinstance(durations, int):
+        durations = [durations] * len(indices)
+
+    targets, target_durations = [indices[0]], [durations[0]]
+    for frame, duration in zip(indices[1:], durations[1:]):
+        if np.array_equal(frame, targets[-1]):
+            target_durations[-1] += duration
+        else:
+            targets.append(frame)
+            target_durations.append(duration)
+
+    height, width = targets[0].shape
+    rects = [(0, 0, width, height)]
+    disposals = []
+    canvas = np.full((height, width), TRANSPARENT_INDEX, dtype=np.uint8)
+    backgrounds = [canvas]
+
+    for i, target in enumerate(targets):
+        following = targets[(i + 1) % len(targets)]
+        holes = _bbox((target != TRANSPARENT_INDEX) & (following == TRANSPARENT_INDEX))
+        if holes is None:
+            disposals.append(DISPOSAL_NONE)
+            canvas = target
+        else:
+            rects[i] = _union(rects[i], holes)
+            disposals.append(DISPOSAL_BACKGROUND)
+            left, top, right, bottom = rects[i]
+            canvas = target.copy()
+            canvas[top:bottom, left:right] = TRANSPARENT_INDEX
+
+        if i + 1 < len(targets):
+            rects.append(_bbox(following != canvas) or (0, 0, 1, 1))
+            backgrounds.append(canvas)
+
+    frames = []
+    for target, background, rect, duration, disposal in zip(targets, backgrounds, rects, target_durations,
+                                                             disposals):
+        left, top, right, bottom = rect
+        region = target[top:bottom, left:right]
+        frames.append(DeltaFrame(np.where(region == background[top:bottom, left:right], TRANSPARENT_INDEX, region),
+                                 (left, top), duration, disposal))
+
+    return frames
+
+
+def _write_delta_gif(palette: np.ndarray, indices: np.ndarray, durations: Union[int, List[int]], fp,
+                     loop: Optional[int] = None):
+    height, width = indices.shape[1:]
+
+    # Logical screen with a 256 entry global color table, no local tables are written
+    fp.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0xf7, TRANSPARENT_INDEX, 0) + palette.tobytes())
+    if loop is not None:
+        fp.write(b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', loop) + b'\x00')
+
+    for frame in delta_frames(indices, durations):
+        for data in GifImagePlugin.getdata(Image.fromarray(frame.indices, 'P'), frame.offset,
+                                           transparency=TRANSPARENT_INDEX, duration=frame.duration,
+                                           disposal=frame.disposal, interlace=0):
+            fp.write(data)
+
+    fp.write(b';')
+
+
+def save_transparent_gif(images: List[Image.Image], durations: Union[int, List[int]], save_file,
+                         alpha_threshold: int = 0, matte: Optional[Tuple[int, int, int]] = None, delta: bool = True,
+                         **kwargs):
+    """Saves frames as a transparent GIF sharing one global palette
+
+    Parameters:
+        images: a list of equally sized PIL Image objects that compose the GIF frames
+        durations: an int or List[int] that describes the animation durations for the frames of this GIF
+        save_file: A filename (string), pathlib.Path object or file object. (This parameter corresponds
+                   and is passed to the PIL.Image.save() method.)
+        alpha_threshold: pixels with an alpha at or below this value are made transparent
+        matte: color partially transparent pixels are blended onto, instead of dropping their alpha
+        delta: write only the changed sub-rectangle of each frame and merge identical frames. Only the
+               loop option is honoured from kwargs in this mode.
+    """
+    palette, indices = quantize_frames(images, alpha_threshold, matte)
+    save_indexed_gif(palette, indices, durations, save_file, delta, **kwargs)
+
+
+def save_indexed_gif(palette: np.ndarray, indices: np.ndarray, durations: Union[int, List[int]], save_file,
+                     delta: bool = True, **kwargs):
+    """Saves frames already quantized to palette indices, as returned by quantize_frames, as a transparent GIF
+
+    See save_transparent_gif for the parameters.
+    """
+    if delta and len(indices) > 1:
+        if isinstance(save_file, (str, os.PathLike)):
+            with open(save_file, 'wb') as fp:
+                _write_delta_gif(palette, indices, durations, fp, kwargs.get('loop'))
+        else:
+            _write_delta_gif(palette, indices, durations, save_file, kwargs.get('loop'))
+        return
+
+    palette_bytes = palette.tobytes()
+
+    frames = []
+    for frame in indices:
+        image = Image.fromarray(frame, 'P')
+        image.putpalette(palette_bytes)
+        frames.append(image)
+
+    frames[0].save(save_file, **{
+        'format': 'GIF',
+        'save_all': True,
+        'append_images': frames[1:],
+        'duration': durations,
+        'disposal': 2,
+        'optimize': False,
+        'palette': palette_bytes,
+        'transparency': TRANSPARENT_INDEX,
+        'background': TRANSPARENT_INDEX,
+        **kwargs,
+    })
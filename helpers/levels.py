@@ -0,0 +1,62 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# XP needed to reach a level is 20 * (level - 1) ** 2 + 35, with level 0 below that
+LEVEL_BASE_XP = 35
+LEVEL_XP_FACTOR = 20
+
+
+class LevelProgress(NamedTuple):
+    level: int
+    floor: int
+    ceiling: int
+    fraction: float
+
+
+def get_min_xp_for_level(level: int) -> int:
+    if level > 0:
+        return LEVEL_XP_FACTOR * (level - 1) ** 2 + LEVEL_BASE_XP
+    return 0
+
+
+def get_level_from_xp(xp: int) -> int:
+    if xp < LEVEL_BASE_XP:
+        return 0
+    return math.isqrt((xp - LEVEL_BASE_XP) // LEVEL_XP_FACTOR) + 1
+
+
+def level_progress(xp: int) -> LevelProgress:
+    level = get_level_from_xp(xp)
+    floor = get_min_xp_for_level(level)
+    ceiling = get_min_xp_for_level(level + 1)
+
+    return LevelProgress(level, floor, ceiling, (xp - floor) / (ceiling - floor))
+
+
+def get_min_xp_for_levels(levels: np.ndarray) -> np.ndarray:
+    levels = np.asarray(levels, dtype=np.int64)
+    return np.where(levels > 0, LEVEL_XP_FACTOR * (levels - 1) ** 2 + LEVEL_BASE_XP, 0)
+
+
+def get_levels_from_xp(xp: np.ndarray) -> np.ndarray:
+    xp = np.asarray(xp, dtype=np.int64)
+    steps = np.maximum(xp - LEVEL_BASE_XP, 0) // LEVEL_XP_FACTOR
+
+    # float square roots can be off by one for large values, nudge them onto the exact integer root
+    roots = np.sqrt(steps).astype(np.int64)
+    roots -= roots * roots > steps
+    roots += (roots + 1) * (roots + 1) <= steps
+
+    return np.where(xp < LEVEL_BASE_XP, 0, roots + 1)
+
+
+def levels_progress(xp: np.ndarray) -> LevelProgress:
+    """level_progress over a whole array of XP values, with each field an array"""
+    xp = np.asarray(xp, dtype=np.int64)
+    levels = get_levels_from_xp(xp)
+    floors = get_min_xp_for_levels(levels)
+    ceilings = get_min_xp_for_levels(levels + 1)
+
+    return LevelProgress(levels, floors, ceilings, (xp - floors) / (ceilings - floors))
@@ -1,4 +1,5 @@
 import datetime
+import functools
 
 from bot.config import bot
 
@@ -9,6 +10,23 @@ class SingletonBase:
             cls.instance = super().__new__(cls, *args, **kwargs)
         return cls.instance
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if '__init__' not in cls.__dict__:
+            return
+
+        init = cls.__init__
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kwargs):
+            # the shared instance is only initialised once, so that clients keep their pools between calls
+            if not self.__dict__.get('_initialized'):
+                init(self, *args, **kwargs)
+                self._initialized = True
+
+        cls.__init__ = __init__
+
 
 def resolve_id(discord_id: int):
     return bot.get_user(discord_id)
@@ -1,58 +1,230 @@
+import asyncio
 import datetime
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import aiohttp
 import nextcord
-from sqlalchemy import select
+from sqlalchemy import BigInteger, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 
 from bot.api_compatability_layer import get_chat_xp
+from helpers.levels import get_level_from_xp
+from helpers.utilities import SingletonBase
 from store.PostgresClient import PostgresClient
+from store.RedisClient import RedisClient
 from store.User import User
 
+XP_FLUSH_INTERVAL = float(os.environ.get('XP_FLUSH_INTERVAL', 30))
+XP_RECONCILE_INTERVAL = float(os.environ.get('XP_RECONCILE_INTERVAL', 600))
+XP_REFRESH_BATCH = int(os.environ.get('XP_REFRESH_BATCH', 500))
 
-def get_level_from_xp(xp: int) -> int:
-    i = 1
-    while True:
-        if get_min_xp_for_level(i) > xp:
-            return i - 1
-        i += 1
+RANKING_KEY = 'xp:ranking'
+RANKING_REBUILD_KEY = 'xp:ranking:rebuild'
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
 
 
-def get_min_xp_for_level(level: int) -> int:
-    if level > 0:
-        return 20 * (level - 1) ** 2 + 35
-    return 0
-
-
-async def get_xp(discord_user: nextcord.User):
-    async with PostgresClient().session() as session:
-        user = (await session.execute(select(User).where(User.discord_id == discord_user.id))).scalar()
-
-        if not user:
-            user = User(discord_id=discord_user.id,
-                        xp=0,
-                        xp_refreshed=datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc))
-            session.add(user)
-
-        refresh_time = datetime.datetime.now(datetime.timezone.utc)
-
-        xp_delta = (await get_chat_xp([user.discord_id], [(user.xp_refreshed, refresh_time)]))[0]
-        if xp_delta is not None:
-            user.xp += xp_delta
-            user.xp_refreshed = refresh_time
+class XPAccumulator(SingletonBase):
+    """Write-behind store of discord XP
+
+    Messages only touch in-memory counters. Pending XP, along with any chat XP earned on the website since the
+    last refresh, is written to the discord_user table in batches by flush.
+    """
+
+    def __init__(self):
+        self._lock = None
+        self._xp: Dict[int, int] = {}
+        self._refreshed: Dict[int, datetime.datetime] = {}
+        self._levels: Dict[int, int] = {}
+        self._pending: Dict[int, int] = {}
+
+    async def _load(self, discord_ids: Iterable[int]):
+        discord_ids = [discord_id for discord_id in discord_ids if discord_id not in self._xp]
+        if not discord_ids:
+            return
+
+        async with PostgresClient().session() as session:
+            # a single array parameter keeps the statement text, and so its prepared statement, the same
+            users = (await session.execute(select(User).where(User.discord_id == any_(
+                bindparam('discord_ids', discord_ids, type_=ARRAY(BigInteger)))))).scalars().all()
+
+        # another load may have finished for the same users while this one was waiting
+        for user in users:
+            if user.discord_id not in self._xp:
+                self._xp[user.discord_id] = user.xp
+                self._refreshed[user.discord_id] = user.xp_refreshed
+
+        for discord_id in discord_ids:
+            self._xp.setdefault(discord_id, 0)
+            self._refreshed.setdefault(discord_id, EPOCH)
+
+    async def add(self, discord_id: int, xp: int = 1) -> Tuple[int, int]:
+        """Adds xp to a user and returns their level before and after"""
+        if discord_id not in self._xp:
+            await self._load([discord_id])
+
+        # levels gained from chat XP picked up during a flush are reported on the next message
+        level_before = self._levels.get(discord_id, get_level_from_xp(self._xp[discord_id]))
+
+        self._xp[discord_id] += xp
+        self._pending[discord_id] = self._pending.get(discord_id, 0) + xp
+
+        level_after = self._levels[discord_id] = get_level_from_xp(self._xp[discord_id])
+        return level_before, level_after
+
+    def xp(self, discord_id: int) -> int:
+        return self._xp[discord_id]
+
+    async def flush(self, refresh: Iterable[int] = ()):
+        """Writes pending XP, refreshing the chat XP of pending users and of those in refresh"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            discord_ids = list(set(self._pending) | set(refresh))
+            if not discord_ids:
+                return
+
+            await self._load(discord_ids)
+            refresh_time = datetime.datetime.now(datetime.timezone.utc)
+
+            try:
+                deltas = await get_chat_xp(discord_ids,
+                                           [(self._refreshed[discord_id], refresh_time) for discord_id in discord_ids])
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # keep the local XP moving, chat XP is picked up by a later flush
+                deltas = None
+
+            # taken only once nothing can fail before the write, which puts it back if it does not go through
+            pending = {discord_id: self._pending.pop(discord_id, 0) for discord_id in discord_ids}
+
+            rows = []
+            for i, discord_id in enumerate(discord_ids):
+                delta = deltas[i] if deltas else None
+                rows.append((discord_id, pending[discord_id] + (delta or 0),
+                             refresh_time if delta is not None else self._refreshed[discord_id], delta))
+
+            try:
+                await self._write(rows)
+            except Exception:
+                for discord_id, xp in pending.items():
+                    self._pending[discord_id] = self._pending.get(discord_id, 0) + xp
+                raise
+
+            for discord_id, _, refreshed, delta in rows:
+                self._refreshed[discord_id] = refreshed
+                self._xp[discord_id] += delta or 0
+
+            await XPRanking().update({discord_id: self._xp[discord_id] for discord_id in discord_ids})
+
+    async def _write(self, rows: List[Tuple[int, int, datetime.datetime, Optional[int]]]):
+        values = [{'discord_id': discord_id, 'xp': xp, 'xp_refreshed': refreshed}
+                  for discord_id, xp, refreshed, delta in rows if xp or delta is not None]
+        if not values:
+            return
+
+        users = User.__table__
+        statement = insert(users)
+        statement = statement.on_conflict_do_update(index_elements=[users.c.discord_id], set_={
+            'xp': users.c.xp + statement.excluded.xp,
+            'xp_refreshed': statement.excluded.xp_refreshed,
+        })
+
+        async with PostgresClient().session() as session:
+            # one prepared statement, executed for every row
+            await session.execute(statement, values)
             await session.commit()
 
-        return user.xp
-
 
-async def get_all_xp():
+async def refresh_chat_xp():
+    """Picks up chat XP earned on the website by every user, including those who have not talked on discord since"""
     async with PostgresClient().session() as session:
-        users = (await session.execute(select(User))).scalars().all()
+        discord_ids = (await session.execute(select(User.discord_id))).scalars().all()
 
-        refresh_time = datetime.datetime.now(datetime.timezone.utc)
-        for i, xp_delta in enumerate(await get_chat_xp([user.discord_id for user in users],
-                                                       [(user.xp_refreshed, refresh_time) for user in users])):
-            if xp_delta is not None:
-                users[i].xp += xp_delta
-                users[i].xp_refreshed = refresh_time
+    # flushed in batches, so that message XP is not held back behind the whole table
+    for i in range(0, len(discord_ids), XP_REFRESH_BATCH):
+        await XPAccumulator().flush(refresh=discord_ids[i:i + XP_REFRESH_BATCH])
 
-        await session.commit()
-        return users
+
+async def get_xp(discord_user: nextcord.User):
+    accumulator = XPAccumulator()
+    await accumulator.flush(refresh=[discord_user.id])
+
+    return accumulator.xp(discord_user.id)
+
+
+class XPRanking(SingletonBase):
+    """Discord XP ranking kept in a Redis sorted set
+
+    Every flush updates the scores of the users it wrote. reconcile rebuilds the whole set from Postgres, and until
+    it first has, the ranking is read from Postgres.
+    """
+
+    def __init__(self):
+        # scores written while reconcile is building the set from an older snapshot
+        self._since_snapshot: Optional[Dict[int, int]] = None
+
+    async def update(self, xp: Dict[int, int]):
+        if not xp:
+            return
+
+        if self._since_snapshot is not None:
+            self._since_snapshot.update(xp)
+        await RedisClient().conn.zadd(RANKING_KEY, {str(discord_id): value for discord_id, value in xp.items()})
+
+    async def reconcile(self):
+        self._since_snapshot = {}
+
+        try:
+            async with PostgresClient().session() as session:
+                users = (await session.execute(select(User.discord_id, User.xp))).all()
+
+            conn = RedisClient().conn
+            async with conn.pipeline(transaction=True) as pipe:
+                pipe.delete(RANKING_REBUILD_KEY)
+                if users:
+                    pipe.zadd(RANKING_REBUILD_KEY, {str(discord_id): xp or 0 for discord_id, xp in users})
+                    pipe.rename(RANKING_REBUILD_KEY, RANKING_KEY)
+                else:
+                    pipe.delete(RANKING_KEY)
+                await pipe.execute()
+
+            if since := self._since_snapshot:
+                await conn.zadd(RANKING_KEY, {str(discord_id): value for discord_id, value in since.items()})
+        finally:
+            self._since_snapshot = None
+
+    async def top(self, n: int) -> List[User]:
+        conn = RedisClient().conn
+        if not await conn.exists(RANKING_KEY):
+            async with PostgresClient().session() as session:
+                return (await session.execute(
+                    select(User).order_by(User.xp.desc().nullslast()).limit(n))).scalars().all()
+
+        return [User(discord_id=int(discord_id), xp=int(xp))
+                for discord_id, xp in await conn.zrevrange(RANKING_KEY, 0, n - 1, withscores=True)]
+
+    async def rank(self, discord_id: int) -> Optional[Tuple[int, User]]:
+        """Zero-based position of a user along with their XP, or None if they are not ranked"""
+        async with RedisClient().conn.pipeline(transaction=False) as pipe:
+            pipe.exists(RANKING_KEY)
+            pipe.zrevrank(RANKING_KEY, str(discord_id))
+            pipe.zscore(RANKING_KEY, str(discord_id))
+            ranked, position, xp = await pipe.execute()
+
+        if not ranked:
+            return await self._rank_from_postgres(discord_id)
+        if position is None:
+            return None
+        return position, User(discord_id=discord_id, xp=int(xp))
+
+    @staticmethod
+    async def _rank_from_postgres(discord_id: int) -> Optional[Tuple[int, User]]:
+        async with PostgresClient().session() as session:
+            if (xp := (await session.execute(select(User.xp).where(User.discord_id == discord_id))).scalar()) is None:
+                return None
+
+            position = (await session.execute(select(func.count()).where(User.xp > xp))).scalar()
+
+        return position, User(discord_id=discord_id, xp=xp)
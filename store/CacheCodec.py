@@ -0,0 +1,143 @@
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict
+
+import msgpack
+
+from helpers.utilities import SingletonBase
+
+CACHE_CODEC = os.environ.get('CACHE_CODEC', 'msgpack')
+CACHE_CODEC_COMPRESS_MIN_BYTES = int(os.environ.get('CACHE_CODEC_COMPRESS_MIN_BYTES', 4096))
+CACHE_CODEC_COMPRESS_LEVEL = int(os.environ.get('CACHE_CODEC_COMPRESS_LEVEL', 1))
+
+# Encoded values start with a NUL byte, the id of their codec and their flags. Values written before there were
+# codecs never start with a NUL byte, and values of a codec that is no longer known are treated as missing, so the
+# format can change without flushing Redis.
+MAGIC = b'\x00'
+FLAG_ZLIB = 1
+
+
+class UnknownFormat(ValueError):
+    pass
+
+
+class Codec:
+    id: int
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class RawCodec(Codec):
+    """Bytes as they are, for images and other data that is already compact"""
+    id, name = 0, 'raw'
+
+    def dumps(self, value: bytes) -> bytes:
+        return bytes(value)
+
+    def loads(self, data: bytes) -> bytes:
+        return data
+
+
+class JsonCodec(Codec):
+    id, name = 1, 'json'
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    id, name = 2, 'msgpack'
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+CODECS: Dict[str, Codec] = {codec.name: codec for codec in (RawCodec(), JsonCodec(), MsgpackCodec())}
+CODEC_IDS: Dict[int, Codec] = {codec.id: codec for codec in CODECS.values()}
+
+
+class CacheCodecStats:
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+        self.compressed = 0
+        self.value_bytes = 0
+        self.stored_bytes = 0
+        self.decode_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'encoded': self.encoded,
+            'decoded': self.decoded,
+            'compressed': self.compressed,
+            'value_bytes': self.value_bytes,
+            'stored_bytes': self.stored_bytes,
+            'compression_ratio': self.stored_bytes / self.value_bytes if self.value_bytes else 1.0,
+            'decode_ms': self.decode_seconds / self.decoded * 1000 if self.decoded else 0.0,
+        }
+
+
+class CacheCodec(SingletonBase):
+    """Encodes values stored in Redis with a versioned header
+
+    Values are encoded with CACHE_CODEC unless a codec is asked for, and compressed with zlib when they are at
+    least CACHE_CODEC_COMPRESS_MIN_BYTES and that makes them smaller. Any known format is decoded, whatever the
+    current CACHE_CODEC.
+    """
+
+    def __init__(self):
+        self.codec = CODECS[CACHE_CODEC]
+        self._stats = {name: CacheCodecStats() for name in CODECS}
+
+    def encode(self, value: Any, codec: str = None) -> bytes:
+        codec = CODECS[codec] if codec else self.codec
+        data = codec.dumps(value)
+        flags = 0
+
+        stats = self._stats[codec.name]
+        stats.encoded += 1
+        stats.value_bytes += len(data)
+
+        if len(data) >= CACHE_CODEC_COMPRESS_MIN_BYTES:
+            if len(compressed := zlib.compress(data, CACHE_CODEC_COMPRESS_LEVEL)) < len(data):
+                data, flags = compressed, flags | FLAG_ZLIB
+                stats.compressed += 1
+
+        stats.stored_bytes += len(data) + 3
+        return MAGIC + bytes((codec.id, flags)) + data
+
+    def decode(self, data: bytes) -> Any:
+        if data[:1] != MAGIC or len(data) < 3 or (codec := CODEC_IDS.get(data[1])) is None or data[2] & ~FLAG_ZLIB:
+            raise UnknownFormat()
+
+        start = time.perf_counter()
+        try:
+            value = codec.loads(zlib.decompress(data[3:]) if data[2] & FLAG_ZLIB else data[3:])
+        except Exception as e:
+            raise UnknownFormat() from e
+
+        stats = self._stats[codec.name]
+        stats.decoded += 1
+        stats.decode_seconds += time.perf_counter() - start
+
+        return value
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'codec': self.codec.name,
+            'codecs': {name: stats.as_dict() for name, stats in self._stats.items() if stats.encoded or stats.decoded},
+        }
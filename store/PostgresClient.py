@@ -1,20 +1,87 @@
 import os
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
 
 from helpers.utilities import SingletonBase
 
+PG_POOL_SIZE = int(os.environ.get('PG_POOL_SIZE', 5))
+PG_MAX_OVERFLOW = int(os.environ.get('PG_MAX_OVERFLOW', 5))
+PG_POOL_TIMEOUT = float(os.environ.get('PG_POOL_TIMEOUT', 10))
+PG_POOL_RECYCLE = int(os.environ.get('PG_POOL_RECYCLE', 1800))
+PG_STATEMENT_CACHE_SIZE = int(os.environ.get('PG_STATEMENT_CACHE_SIZE', 256))
+
 
 class PostgresClient(SingletonBase):
     def __init__(self):
-        uri = os.environ.get('DATABASE_URL')
-        index_protocol = uri.index('://')
+        self._engine = None
+        self._session = None
 
-        self._uri = 'postgresql+asyncpg://' + uri[index_protocol + 3:]
-        self._engine = create_async_engine(self._uri, poolclass=NullPool, future=True)
+        self._connects = 0
+        self._checkouts = 0
+        self._invalidated = 0
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            uri = os.environ.get('DATABASE_URL')
+            index_protocol = uri.index('://')
+
+            self._engine = create_async_engine(
+                make_url('postgresql+asyncpg://' + uri[index_protocol + 3:]).update_query_dict({
+                    # statements are prepared once per pooled connection and reused by their SQL text
+                    'prepared_statement_cache_size': str(PG_STATEMENT_CACHE_SIZE),
+                }),
+                pool_size=PG_POOL_SIZE,
+                max_overflow=PG_MAX_OVERFLOW,
+                pool_timeout=PG_POOL_TIMEOUT,
+                pool_recycle=PG_POOL_RECYCLE,
+                pool_pre_ping=True,
+                future=True)
+
+            pool = self._engine.sync_engine.pool
+            event.listen(pool, 'connect', self._on_connect)
+            event.listen(pool, 'checkout', self._on_checkout)
+            event.listen(pool, 'invalidate', self._on_invalidate)
+
+        return self._engine
+
+    def _on_connect(self, *args):
+        self._connects += 1
+
+    def _on_checkout(self, *args):
+        self._checkouts += 1
+
+    def _on_invalidate(self, *args):
+        self._invalidated += 1
 
     @property
     def session(self):
-        return sessionmaker(bind=self._engine, expire_on_commit=False, class_=AsyncSession, future=True)
+        if self._session is None:
+            self._session = sessionmaker(bind=self.engine, expire_on_commit=False, class_=AsyncSession, future=True)
+
+        return self._session
+
+    @property
+    def stats(self) -> dict:
+        pool = self._engine.sync_engine.pool if self._engine else None
+
+        return {
+            'size': pool.size() if pool else 0,
+            'max_overflow': PG_MAX_OVERFLOW,
+            'checked_out': pool.checkedout() if pool else 0,
+            'checked_in': pool.checkedin() if pool else 0,
+            'overflow': max(pool.overflow(), 0) if pool else 0,
+            'connects': self._connects,
+            'checkouts': self._checkouts,
+            'invalidated': self._invalidated,
+        }
+
+    async def close(self):
+        if self._engine is not None:
+            await self._engine.dispose()
+
+        self._engine = None
+        self._session = None
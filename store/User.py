@@ -1,11 +1,65 @@
-from sqlalchemy import Column, Integer, BigInteger, DateTime
+import asyncio
+
+from sqlalchemy import Column, Integer, BigInteger, DateTime, Index, inspect, text
 from sqlalchemy.orm import declarative_base
 
+from store.PostgresClient import PostgresClient
+
 
 class User(declarative_base()):
     __tablename__ = 'discord_user'
+    __table_args__ = (
+        Index('discord_user_discord_id_key', 'discord_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     discord_id = Column(BigInteger)
     xp = Column(Integer)
     xp_refreshed = Column(DateTime(timezone=True))
+
+
+async def migrate_discord_id_key(conn):
+    """Adds the unique discord_id index to an existing table, merging duplicated users into their oldest row
+
+    Runs with python -m store.User on every release, and does nothing once the index exists.
+    """
+    await conn.execute(text('LOCK TABLE discord_user IN SHARE ROW EXCLUSIVE MODE'))
+
+    await conn.execute(text('UPDATE discord_user u SET xp = d.xp, xp_refreshed = d.xp_refreshed '
+                            'FROM (SELECT MIN(id) AS id, SUM(xp) AS xp, MAX(xp_refreshed) AS xp_refreshed '
+                            'FROM discord_user GROUP BY discord_id HAVING COUNT(*) > 1) d '
+                            'WHERE u.id = d.id'))
+    await conn.execute(text('DELETE FROM discord_user a USING discord_user b '
+                            'WHERE a.discord_id = b.discord_id AND a.id > b.id'))
+
+    def create(sync_conn):
+        for index in User.__table__.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    await conn.run_sync(create)
+
+
+async def check_discord_id_key():
+    """Raises if the index XP upserts conflict on is missing, which makes every XP flush fail"""
+    def index_names(sync_conn):
+        return {index['name'] for index in inspect(sync_conn).get_indexes(User.__tablename__)}
+
+    try:
+        async with PostgresClient().engine.connect() as conn:
+            names = await conn.run_sync(index_names)
+    finally:
+        await PostgresClient().close()
+
+    if missing := {index.name for index in User.__table__.indexes} - names:
+        raise RuntimeError(f'discord_user is missing {", ".join(sorted(missing))}, run python -m store.User first')
+
+
+async def migrate():
+    async with PostgresClient().engine.begin() as conn:
+        await migrate_discord_id_key(conn)
+
+    await PostgresClient().close()
+
+
+if __name__ == '__main__':
+    asyncio.run(migrate())